@@ -4,13 +4,49 @@ Configuration for functional tests
 """
 import pytest
 import requests
+import asyncio
+import json
+import logging
 import os
+import re
 import subprocess
+import threading
 import time
 import fcntl
+from collections import namedtuple
 from pathlib import Path
 from http.cookies import SimpleCookie
+from playwright.async_api import async_playwright
 from playwright.sync_api import Playwright, Browser, BrowserContext, Page
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+
+log = logging.getLogger(f"e2e.{__name__}")
+
+# Binary assets no test looks at unless marked needs_assets; blocked by default
+ASSET_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+# Resource types no functional test needs; modules opt in by overriding blocked_resource_types
+HEAVY_RESOURCE_TYPES = ASSET_RESOURCE_TYPES | {"stylesheet"}
+
+# File extensions by which block_resources recognises each resource type in a URL
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ("png", "jpe?g", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "font": ("woff2?", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "mp3", "wav", "m4a"),
+    "stylesheet": ("css",),
+}
+
+# Snapshot of a fetched URL: final URL after redirects, HTTP status, decoded body and
+# lower-cased response headers (None where the probe had no headers to record)
+ProbeResponse = namedtuple("ProbeResponse", ["url", "status", "body", "headers"], defaults=[None])
+
+
+def pytest_configure(config):
+    """Emit the tests' own debug logging (the "e2e" logger tree) only when run with -vv"""
+    if config.getoption("verbose") >= 2:
+        logging.getLogger("e2e").setLevel(logging.DEBUG)
 
 
 @pytest.fixture(scope="session")
@@ -110,6 +146,58 @@ def oidc_provider_domain(oidc_provider_url):
     return urlparse(oidc_provider_url).netloc
 
 
+@pytest.fixture(scope="session")
+def compose_services(tests_dir):
+    """
+    The docker compose services, parsed once per session from `docker compose ps --format json`.
+
+    Returns:
+        dict: Service name -> that service's `docker compose ps` record (State, Health, ...)
+    """
+    result = subprocess.run(
+        ["docker", "compose", "ps", "--format", "json"],
+        cwd=str(tests_dir),
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 0, f"docker compose ps failed: {result.stderr}"
+
+    # One JSON object per line
+    services = {}
+    for line in result.stdout.strip().split('\n'):
+        if line.strip():
+            service = json.loads(line)
+            services[service.get('Service', '')] = service
+    return services
+
+
+# How long services_ready waits for the frontend before ending the run
+SERVICES_READY_TIMEOUT = 30
+
+
+@pytest.fixture(scope="session", autouse=True)
+def services_ready():
+    """
+    Probe the frontend once per session before any test runs. If it does not answer
+    within SERVICES_READY_TIMEOUT seconds the run ends with one clear message, rather than
+    every test timing out on its own.
+    """
+    deadline = time.monotonic() + SERVICES_READY_TIMEOUT
+    while True:
+        try:
+            # An unauthenticated request to the root is redirected to the login flow
+            response = requests.get("http://localhost/", allow_redirects=False, timeout=5)
+            if response.status_code in (200, 302):
+                return
+            problem = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            problem = str(e)
+        if time.monotonic() >= deadline:
+            pytest.exit(f"Frontend at http://localhost/ not ready after {SERVICES_READY_TIMEOUT}s ({problem}); "
+                        "start the services first (see tests/README.md)", returncode=1)
+        time.sleep(1)
+
+
 @pytest.fixture(scope="session")
 def browser_context_args(browser_context_args):
     """Configure browser context for tests"""
@@ -120,9 +208,104 @@ def browser_context_args(browser_context_args):
     }
 
 
+# Chromium flags that skip GPU, extension and background-network start-up work a
+# headless test run never uses; /dev/shm is often too small in containers
+CHROMIUM_LAUNCH_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-background-networking",
+    "--disable-extensions",
+]
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args, browser_name):
+    """Launch Chromium with CHROMIUM_LAUNCH_ARGS on top of any pytest-playwright options"""
+    if browser_name != "chromium":
+        return browser_type_launch_args
+    return {
+        **browser_type_launch_args,
+        "args": [*browser_type_launch_args.get("args", []), *CHROMIUM_LAUNCH_ARGS],
+    }
+
+
 @pytest.fixture(scope="function")
-def page(context: BrowserContext) -> Page:
-    """Create a fresh page for each test"""
+def blocked_resource_types(request):
+    """
+    Resource types aborted in every page handed out by the page and
+    authenticated_page fixtures. Images, fonts and media are blocked unless the test
+    is marked needs_assets; a module or class that never inspects visuals can
+    override this to return HEAVY_RESOURCE_TYPES.
+    """
+    if request.node.get_closest_marker("needs_assets"):
+        return frozenset()
+    return ASSET_RESOURCE_TYPES
+
+
+def block_resources(target, resource_types):
+    """
+    Abort requests of the given resource types for a page, or for every page in a context.
+    The route only matches URLs ending in one of those types' RESOURCE_TYPE_EXTENSIONS, so
+    documents, scripts, XHR and the OIDC redirects never make a round trip to Python.
+    """
+    extensions = [extension for resource_type in sorted(resource_types)
+                  for extension in RESOURCE_TYPE_EXTENSIONS.get(resource_type, ())]
+    if not extensions:
+        return
+    url_re = re.compile(rf"\.(?:{'|'.join(extensions)})(?:[?#].*)?$", re.IGNORECASE)
+
+    def _handle(route):
+        if route.request.resource_type in resource_types:
+            # Same error code as test_missing_resources_handling, so a blocked asset reads as a client-side block
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    target.route(url_re, _handle)
+
+
+class BrowserErrors:
+    """Console errors and uncaught page exceptions raised in a test's browser contexts"""
+
+    def __init__(self):
+        self.console_messages = []
+        self.page_exceptions = []
+
+    def attach(self, target):
+        """Collect from a single page, or from every page of a context including pages opened later"""
+        target.on("console", self._on_console)
+        if isinstance(target, Page):
+            target.on("pageerror", self._on_page_error)
+        else:
+            target.on("weberror", self._on_web_error)
+
+    def _on_console(self, msg):
+        if msg.type == "error":
+            self.console_messages.append(msg.text)
+
+    def _on_web_error(self, web_error):
+        self.page_exceptions.append(str(web_error.error))
+
+    def _on_page_error(self, error):
+        self.page_exceptions.append(str(error))
+
+
+@pytest.fixture(scope="function")
+def browser_errors() -> BrowserErrors:
+    """Errors collected from the contexts created by the page and authenticated_page fixtures"""
+    return BrowserErrors()
+
+
+@pytest.fixture(scope="function")
+def page(context: BrowserContext, blocked_resource_types, browser_errors) -> Page:
+    """
+    Create a fresh page for each test. The context comes from pytest-playwright and is
+    new per test, but it is opened on the session-scoped browser, so Chromium is only
+    launched once per worker.
+    """
+    block_resources(context, blocked_resource_types)
+    browser_errors.attach(context)
     page = context.new_page()
     
     # Set longer timeout for authentication flows
@@ -184,37 +367,269 @@ def clear_session_before_each_test(page: Page, oidc_provider_url):
 
 
 
+@pytest.fixture(scope="session")
+def role_storage_state(playwright: Playwright, browser: Browser, pytestconfig, tests_dir):
+    """
+    Fixture to provide the path of the authenticated storage state for a specific user type.
+    The OIDC login is performed in a throwaway context on the session browser and the
+    resulting storage state is saved to .pytest_cache/auth/<user_type>.json, so later
+    contexts (and later test runs) skip the login round trip.
+
+    A cached file is only reused while it is newer than tests/.auth-version, which is
+    touched whenever the docker services are (re)started, and while one unredirected GET
+    of the frontend root with it still returns 200. A session that expired or was lost
+    to a restart or database reset outside make is replaced by a fresh login.
+    """
+    cache_dir = pytestconfig.cache.mkdir("auth")
+    auth_version = tests_dir / ".auth-version"
+    storage_states = {}
+
+    def _is_current(state_path: Path) -> bool:
+        if not state_path.exists() or not auth_version.exists():
+            return False
+        return state_path.stat().st_mtime > auth_version.stat().st_mtime
+
+    def _is_logged_in(state_path: Path) -> bool:
+        # An anonymous or expired session is redirected to the login flow instead
+        context = playwright.request.new_context(ignore_https_errors=True, storage_state=str(state_path))
+        try:
+            return context.get("http://localhost/", max_redirects=0).status == 200
+        except PlaywrightError:
+            return False
+        finally:
+            context.dispose()
+
+    def _role_storage_state(user_type: str):
+        if user_type not in storage_states:
+            state_path = cache_dir / f"{user_type}.json"
+            if not (_is_current(state_path) and _is_logged_in(state_path)):
+                context = browser.new_context(
+                    ignore_https_errors=True,
+                    viewport={"width": 1280, "height": 720},
+                )
+                try:
+                    page = context.new_page()
+                    page.set_default_timeout(30000)
+                    login_as(user_type, page)
+                    # Write then rename so parallel workers never read a half-written file
+                    partial_path = state_path.with_suffix(f".{os.getpid()}.tmp")
+                    context.storage_state(path=partial_path)
+                    os.replace(partial_path, state_path)
+                finally:
+                    context.close()
+            storage_states[user_type] = str(state_path)
+        return storage_states[user_type]
+
+    return _role_storage_state
+
+
 @pytest.fixture(scope="function")
-def authenticated_page(browser: Browser):
+def authenticated_page(browser: Browser, role_storage_state, blocked_resource_types, browser_errors):
     """
     Fixture to provide an authenticated Playwright Page for a specific user type.
-    This creates a new browser context for each user to ensure isolation.
+    Each user type gets one context per test, seeded with that user's cached storage
+    state, so no login round trip is needed. Routes and error listeners are bound to the
+    context, so they also cover pages a test opens itself with context.new_page().
+    At teardown the contexts are closed, taking every page, cookie, storage entry,
+    permission and route the test created with them.
     """
-    created_contexts = []
-    
+    contexts = {}
+
     def _authenticated_page(user_type: str):
-        context = browser.new_context(
+        if user_type not in contexts:
+            context = browser.new_context(
+                ignore_https_errors=True,
+                viewport={"width": 1280, "height": 720},
+                storage_state=role_storage_state(user_type),
+            )
+            block_resources(context, blocked_resource_types)
+            browser_errors.attach(context)
+            contexts[user_type] = context
+        page = contexts[user_type].new_page()
+        page.set_default_timeout(30000)
+
+        return page
+
+    yield _authenticated_page
+
+    for context in contexts.values():
+        try:
+            context.close()
+        except:
+            pass
+
+
+@pytest.fixture(scope="session")
+def admin_certificate_href(browser: Browser, role_storage_state, pytestconfig, tests_dir):
+    """
+    Fixture to provide the certificate detail link of a certificate owned by the admin user.
+    The profile is generated once and the link is kept in the pytest cache alongside the
+    mtime of tests/.auth-version, so it is reused until the services are restarted.
+    Returns None if no certificate could be found after generating the profile.
+    """
+    auth_version = tests_dir / ".auth-version"
+    current_version = auth_version.stat().st_mtime if auth_version.exists() else None
+    cached = pytestconfig.cache.get("e2e/admin_certificate_href", None)
+    if current_version is not None and cached and cached.get("auth_version") == current_version:
+        return cached["href"]
+
+    context = browser.new_context(
+        ignore_https_errors=True,
+        viewport={"width": 1280, "height": 720},
+        storage_state=role_storage_state("admin"),
+    )
+    try:
+        page = context.new_page()
+        page.set_default_timeout(30000)
+
+        # Generate a profile to create a certificate; the profile comes back as a download
+        page.goto("http://localhost/", wait_until="domcontentloaded")
+        try:
+            with page.expect_download(timeout=10000):
+                page.click("text=Generate Profile")
+        except PlaywrightTimeoutError as e:
+            log.warning("No profile download after generating admin certificate: %s", e)
+
+        # Read the newest certificate's link from the list as soon as it is rendered
+        page.goto("http://localhost/profile/certificates", wait_until="domcontentloaded")
+        view_link = page.locator('a[href*="/certificates/"]:has-text("View")').first
+        try:
+            view_link.wait_for(timeout=10000)
+            href = view_link.get_attribute('href')
+        except PlaywrightTimeoutError:
+            href = None
+    finally:
+        context.close()
+
+    if href and current_version is not None:
+        pytestconfig.cache.set("e2e/admin_certificate_href", {"href": href, "auth_version": current_version})
+    return href
+
+
+@pytest.fixture(scope="function")
+def request_context(playwright: Playwright, role_storage_state):
+    """
+    Fixture to provide a Playwright APIRequestContext, optionally authenticated as a user type.
+    Use this instead of a page when a test only inspects status, final URL or body:
+    requests skip the renderer entirely, so each probe is a single HTTP round trip.
+    Called with no user type it returns an unauthenticated context.
+    """
+    created_contexts = []
+
+    def _request_context(user_type: str = None):
+        context = playwright.request.new_context(
             ignore_https_errors=True,
-            viewport={"width": 1280, "height": 720},
+            storage_state=role_storage_state(user_type) if user_type else None,
         )
         created_contexts.append(context)
-        page = context.new_page()
-        page.set_default_timeout(30000)
+        return context
 
-        # Perform login within this new context
-        login_as(user_type, page)
+    yield _request_context
 
-        return page
-    
-    yield _authenticated_page
-    
-    # Cleanup all created contexts
     for context in created_contexts:
         try:
-            context.close()
+            context.dispose()
         except:
             pass
 
+
+class AsyncPlaywrightRunner:
+    """
+    One async Playwright driver on a long-lived event loop thread. The loop never meets
+    the sync API's loop on the main thread, and the driver process is started once
+    rather than for every batch of concurrent requests.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-playwright", daemon=True)
+        self._thread.start()
+        self._playwright = self._submit(async_playwright().start())
+
+    def _submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def issue(self, storage_state, issue):
+        """Run issue(context) on a fresh async APIRequestContext and return its result"""
+        async def _run():
+            context = await self._playwright.request.new_context(
+                ignore_https_errors=True,
+                storage_state=storage_state,
+            )
+            try:
+                return await issue(context)
+            finally:
+                await context.dispose()
+
+        return self._submit(_run())
+
+    def stop(self):
+        try:
+            self._submit(self._playwright.stop())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+
+@pytest.fixture(scope="session")
+def async_playwright_runner():
+    """The worker's AsyncPlaywrightRunner, started on first use and stopped at the end of the session"""
+    runner = AsyncPlaywrightRunner()
+    yield runner
+    runner.stop()
+
+
+@pytest.fixture(scope="session")
+def fetch_concurrently(role_storage_state, async_playwright_runner):
+    """
+    Fixture to GET a batch of URLs at once, optionally authenticated as a user type.
+    All requests are issued together with asyncio.gather on the async Playwright API.
+
+    Returns a dict mapping each requested URL to a ProbeResponse.
+    """
+    def _fetch_concurrently(urls, user_type: str = None):
+        storage_state = role_storage_state(user_type) if user_type else None
+
+        async def _gather(context):
+            responses = await asyncio.gather(*(context.get(url) for url in urls))
+            return {
+                url: ProbeResponse(response.url, response.status, await response.text(), response.headers)
+                for url, response in zip(urls, responses)
+            }
+
+        return async_playwright_runner.issue(storage_state, _gather)
+
+    return _fetch_concurrently
+
+
+@pytest.fixture(scope="session")
+def post_concurrently(async_playwright_runner):
+    """
+    Fixture to POST several form bodies to one URL at once, for race-condition checks.
+    storage_state is a path or a dict from BrowserContext.storage_state(), so the
+    requests can share the session (and CSRF token) of a browser page.
+
+    Returns a list of ProbeResponse in the order of forms.
+    """
+    def _post_concurrently(url, forms, storage_state=None):
+        async def _gather(context):
+            responses = await asyncio.gather(*(context.post(url, form=form) for form in forms))
+            return [
+                ProbeResponse(response.url, response.status, await response.text(), response.headers)
+                for response in responses
+            ]
+
+        return async_playwright_runner.issue(storage_state, _gather)
+
+    return _post_concurrently
+
+
+def click_oidc_login(page: Page, user_type: str = "admin"):
+    """Click the tiny-oidc "Login as <user_type>" button; click() waits for it to be actionable"""
+    page.get_by_role("button", name=f"Login as {user_type}", exact=True).click()
+
+
 def login_as(user_type: str, page: Page):
     """
     Helper function to properly log in as specified user following the full flow:
@@ -239,9 +654,7 @@ def login_as(user_type: str, page: Page):
     # Should be redirected to tiny-oidc login page
     try:
         expect(page.locator("h1")).to_contain_text("Login - kinda", timeout=10000)
-        login_button = page.locator(f'button:has-text("Login as {user_type}")')
-        expect(login_button).to_be_visible(timeout=5000)
-        login_button.click()
+        click_oidc_login(page, user_type)
         page.wait_for_load_state("networkidle", timeout=15000)
         print(f"  ✓ {user_type} login completed")
         
@@ -330,38 +743,56 @@ def api_client(oidc_provider_url, oidc_provider_domain):
 
 
 @pytest.fixture(scope="function")
-def cli_browser_integration(page: Page, repository_root):
+def cli_browser_integration(page: Page, repository_root, tmp_path):
     """
-    Helper fixture for CLI commands that need browser integration
+    Helper fixture for CLI commands that need browser integration.
+    The mock xdg-open link and its capture files live in the test's own tmp_path, and
+    the mock is put first on PATH only in the environment handed to the CLI
+    subprocesses, so tests on parallel workers never share or remove each other's mock.
     """
     class CLIBrowserIntegration:
-        def __init__(self, page, repository_root):
+        def __init__(self, page, repository_root, work_dir):
             self.page = page
             self.mock_xdg_open_path = str(repository_root / "tests" / "end-to-end" / "mock-xdg-open.sh")
-            self.capture_file = "/tmp/xdg-open-captured-url.txt"
-            self.log_file = "/tmp/xdg-open-capture.log"
-            
+            self.bin_dir = str(work_dir / "bin")
+            self.mock_link = os.path.join(self.bin_dir, "xdg-open")
+            self.capture_file = str(work_dir / "xdg-open-captured-url.txt")
+            self.log_file = str(work_dir / "xdg-open-capture.log")
+
+            # Environment for CLI subprocesses: mock xdg-open first on PATH, writing to this test's files
+            self.env = {
+                **os.environ,
+                "PATH": f"{self.bin_dir}:{os.environ.get('PATH', '')}",
+                "XDG_OPEN_CAPTURE_FILE": self.capture_file,
+                "XDG_OPEN_LOG_FILE": self.log_file,
+            }
+
         def setup_mock_xdg_open(self):
-            """Setup PATH to use our mock xdg-open"""
-            # Clear any previous captures
+            """Create this test's xdg-open link to the mock and clear any previous capture"""
             if os.path.exists(self.capture_file):
                 os.remove(self.capture_file)
-                
-            # Set PATH to prioritize our mock script
-            test_bin_dir = os.path.dirname(self.mock_xdg_open_path)
-            current_path = os.environ.get('PATH', '')
-            os.environ['PATH'] = f"{test_bin_dir}:{current_path}"
-            
+
             # Create symlink so our script is found as 'xdg-open'
-            mock_link = os.path.join(test_bin_dir, "xdg-open")
-            if os.path.exists(mock_link):
-                os.remove(mock_link)
-            os.symlink(self.mock_xdg_open_path, mock_link)
-            os.chmod(mock_link, 0o755)
-            
+            if not os.path.lexists(self.mock_link):
+                os.makedirs(self.bin_dir, exist_ok=True)
+                os.symlink(self.mock_xdg_open_path, self.mock_link)
+
+        def with_auth_url_output(self, command):
+            """
+            For a profile command with OIDC authentication, add --output-auth-url stderr for reliable URL capture.
+            command is a shell string or an argv list; the same type is returned.
+            """
+            command_text = command if isinstance(command, str) else " ".join(command)
+            if ('get-oidc-profile' in command_text or 'get_openvpn_profile.py' in command_text) and '--output-auth-url' not in command_text:
+                if isinstance(command, str):
+                    return command + ' --output-auth-url stderr'
+                return [*command, '--output-auth-url', 'stderr']
+            return command
+
         def run_cli_command(self, command, timeout=30):
             """
-            Run a CLI command that might trigger xdg-open or output auth URL
+            Run a CLI command that might trigger xdg-open or output auth URL.
+            An argv list is run directly; a string is run through the shell.
             Returns (process_result, captured_url)
             """
             captured_url = None
@@ -369,17 +800,16 @@ def cli_browser_integration(page: Page, repository_root):
             # Always setup mock xdg-open to prevent browser popups
             self.setup_mock_xdg_open()
 
-            # If this is a profile command with OIDC authentication, add --output-auth-url stderr for reliable URL capture
-            if ('get-oidc-profile' in command or 'get_openvpn_profile.py' in command) and '--output-auth-url' not in command:
-                command = command + ' --output-auth-url stderr'
-            
+            command = self.with_auth_url_output(command)
+
             # Run the CLI command
             process = subprocess.run(
                 command,
-                shell=True,
+                shell=isinstance(command, str),
                 capture_output=True,
                 text=True,
-                timeout=timeout
+                timeout=timeout,
+                env=self.env
             )
             
             # Check for AUTH_URL in stderr output
@@ -391,7 +821,6 @@ def cli_browser_integration(page: Page, repository_root):
             
             # Fallback: Check if a URL was captured via xdg-open mock
             if not captured_url:
-                self.setup_mock_xdg_open()
                 if os.path.exists(self.capture_file):
                     with open(self.capture_file, 'r') as f:
                         captured_url = f.read().strip()
@@ -400,7 +829,8 @@ def cli_browser_integration(page: Page, repository_root):
 
         def start_cli_command_background(self, command):
             """
-            Start a CLI command in background and return process handle and captured auth URL
+            Start a CLI command in background and return process handle and captured auth URL.
+            An argv list is run directly; a string is run through the shell.
             Returns (process_handle, captured_url)
             """
             captured_url = None
@@ -408,17 +838,16 @@ def cli_browser_integration(page: Page, repository_root):
             # Always setup mock xdg-open to prevent browser popups
             self.setup_mock_xdg_open()
 
-            # If this is a profile command with OIDC authentication, add --output-auth-url stderr for reliable URL capture
-            if ('get-oidc-profile' in command or 'get_openvpn_profile.py' in command) and '--output-auth-url' not in command:
-                command = command + ' --output-auth-url stderr'
+            command = self.with_auth_url_output(command)
 
             # Start the CLI command in background
             process = subprocess.Popen(
                 command,
-                shell=True,
+                shell=isinstance(command, str),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                env=self.env
             )
 
             # Give the CLI a moment to start and output the auth URL
@@ -468,16 +897,14 @@ def cli_browser_integration(page: Page, repository_root):
             
         def cleanup(self):
             """Clean up mock xdg-open setup"""
-            test_bin_dir = os.path.dirname(self.mock_xdg_open_path)
-            mock_link = os.path.join(test_bin_dir, "xdg-open")
-            if os.path.exists(mock_link):
-                os.remove(mock_link)
+            if os.path.lexists(self.mock_link):
+                os.remove(self.mock_link)
                 
             # Clean up capture files
             for filepath in [self.capture_file, self.log_file]:
                 if os.path.exists(filepath):
                     os.remove(filepath)
                     
-    integration = CLIBrowserIntegration(page, repository_root)
+    integration = CLIBrowserIntegration(page, repository_root, tmp_path)
     yield integration
     integration.cleanup()
\ No newline at end of file
@@ -3,13 +3,15 @@
 # Captures URLs that would normally be opened in browser and stores them for Playwright to use
 
 URL="$1"
-CAPTURE_FILE="/tmp/xdg-open-captured-url.txt"
+# cli_browser_integration points these at the test's own tmp_path
+CAPTURE_FILE="${XDG_OPEN_CAPTURE_FILE:-/tmp/xdg-open-captured-url.txt}"
+LOG_FILE="${XDG_OPEN_LOG_FILE:-/tmp/xdg-open-capture.log}"
 
 # Write the URL to a capture file that tests can read
 echo "$URL" > "$CAPTURE_FILE"
 
 # Log the capture for debugging
-echo "$(date): Captured URL: $URL" >> /tmp/xdg-open-capture.log
+echo "$(date): Captured URL: $URL" >> "$LOG_FILE"
 
 # Exit successfully (don't actually open browser)
 exit 0
\ No newline at end of file
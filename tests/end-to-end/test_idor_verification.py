@@ -227,12 +227,11 @@ class TestIDORProtectionE2E:
     def test_certificate_list_isolation(self, authenticated_page: Callable[[str], Page]):
         """Test that users only see their own certificates in the list."""
 
-        # Create certificate as admin
+        # Both certificates are created on the cached-login contexts of the session browser
         admin_page = authenticated_page("admin")
         admin_fingerprint = create_test_certificate(admin_page, "admin")
         admin_page.close()
 
-        # Create certificate as regular user
         user_page = authenticated_page("accounts")
         user_fingerprint = create_test_certificate(user_page, "accounts")
 
@@ -23,98 +23,231 @@ All tests verify that the application:
 3. Prevents unauthorized access to protected resources
 4. Validates and sanitizes user input properly
 5. Maintains security boundaries under adverse conditions
+
+The tests are independent of each other and can be spread across pytest-xdist
+workers (see `make test_negative_paths`); PSK descriptions carry the worker id so
+concurrent workers never collide.
 """
 
+import logging
+import re
 import pytest
-from playwright.sync_api import Page, expect
-from typing import Callable
+from playwright.sync_api import APIRequestContext, Browser, BrowserContext, Page, Response, expect
+from playwright.sync_api import Error as PlaywrightError
+from typing import Callable, Dict, List, Optional
+
+from conftest import HEAVY_RESOURCE_TYPES, BrowserErrors, ProbeResponse, block_resources
+
+log = logging.getLogger(f"e2e.{__name__}")
+
+# Phrases that show a request was turned away. Case-sensitive phrases and the
+# (?i:...) groups mirror exactly which checks were made against lowercased content.
+ACCESS_DENIED_RE = re.compile(r"Login|Sign in|Access denied|Unauthorized|403|404|Not Found|Please log in")
+ADMIN_ACCESS_DENIED_RE = re.compile(r"Access denied|Forbidden|403|404|Not Found|Not authorized")
+CROSS_USER_DENIED_RE = re.compile(r"Access denied|(?i:not found|unauthorized|forbidden)")
+REVOCATION_REJECTED_RE = re.compile(r"404|405|Not Found|Method Not Allowed|Certificate not found|(?i:error)")
+VALIDATION_ERROR_RE = re.compile(r"required|error|invalid|validation|missing", re.IGNORECASE)
+LONG_INPUT_REJECTED_RE = re.compile(r"error|invalid|too long", re.IGNORECASE)
+PAGINATION_REJECTED_RE = re.compile(r"error|invalid|bad request", re.IGNORECASE)
+SERVER_ERROR_RE = re.compile(r"500 Internal Server Error|Internal Server Error|HTTP 500|Server Error \(500\)|Application Error")
+# A serialized document that still has its html and body skeleton
+PAGE_STRUCTURE_RE = re.compile(r"<html.*?<body.*?</html>", re.DOTALL)
+PROFILE_CONTENT_RE = re.compile(r"profile|certificate|vpn|user", re.IGNORECASE)
+STATIC_RESOURCE_RE = re.compile(r"/(assets|static)/|\.(css|js|png|jpe?g|gif|svg|webp|woff2?)(\?|$)")
+
+PROTECTED_URLS = (
+    "http://localhost/profile",
+    "http://localhost/profile/certificates",
+    "http://localhost/admin",
+    "http://localhost/admin/psk",
+    "http://localhost/admin/psk/new",
+    "http://localhost/admin/certificates",
+)
+
+ADMIN_URLS = (
+    "http://localhost/admin",
+    "http://localhost/admin/psk",
+    "http://localhost/admin/psk/new",
+    "http://localhost/admin/certificates",
+)
+
+INVALID_FINGERPRINTS = (
+    "nonexistent123",
+    "../../etc/passwd",
+    "<script>alert('xss')</script>",
+    "' OR '1'='1",
+    "null",
+    "",
+    "a" * 1000,  # Very long fingerprint
+)
+
+INVALID_PAGINATION_URLS = (
+    "http://localhost/admin/certificates?page=-1",
+    "http://localhost/admin/certificates?page=0",
+    "http://localhost/admin/certificates?page=999999",
+    "http://localhost/admin/certificates?page=abc",
+    "http://localhost/admin/certificates?page=<script>alert('xss')</script>",
+    "http://localhost/admin/certificates?page=' OR '1'='1",
+    "http://localhost/admin/certificates?limit=-1",
+    "http://localhost/admin/certificates?limit=0",
+    "http://localhost/admin/certificates?limit=999999",
+    "http://localhost/admin/certificates?limit=abc",
+)
+
+MALICIOUS_QUERIES = (
+    "<script>alert('xss')</script>",
+    "'; DROP TABLE certificates; --",
+    "../../etc/passwd",
+    "%' OR '1'='1' --",
+    "UNION SELECT * FROM users",
+    "{{7*7}}",  # Template injection
+    "${7*7}",   # Expression injection
+    "\\x00",    # Null byte
+    "a" * 10000,  # Very long query
+)
+
+# Over 255 characters, way over typical description limits
+LONG_DESCRIPTION = "A" * 500
+
+SUBMIT_SELECTOR = 'button[type="submit"], input[type="submit"]'
+SEARCH_FIELD_SELECTOR = 'input[name="search"], input[type="search"], input[placeholder*="search" i]'
+
+# Describe every form control on the page in a single round trip to the browser
+FORM_FIELDS_JS = """() => Array.from(document.querySelectorAll('input, textarea, select')).map(e => ({
+    name: e.name, tag: e.tagName.toLowerCase(), type: e.type, placeholder: e.placeholder || ''
+}))"""
+
+# Set several controls in a single round trip, firing the events a user edit would
+FILL_FIELDS_JS = """(values) => {
+    for (const [selector, value] of values) {
+        const field = document.querySelector(selector);
+        if (!field) continue;
+        field.value = value;
+        field.dispatchEvent(new Event('input', {bubbles: true}));
+        field.dispatchEvent(new Event('change', {bubbles: true}));
+    }
+}"""
+
+
+# Action and current values of a form's named controls, as a urlencoded POST would send them
+FORM_VALUES_JS = """(form) => ({
+    action: form.action,
+    values: Object.fromEntries(new FormData(form)),
+})"""
+
+CONCURRENT_SUBMISSIONS = 5
+
+
+def form_fields(page: Page) -> List[Dict[str, str]]:
+    """Snapshot the name, tag, type and placeholder of every form control on the page"""
+    return page.evaluate(FORM_FIELDS_JS)
+
+
+def fill_fields(page: Page, values: Dict[str, str]):
+    """Set the value of each selector's first match, skipping selectors with no match"""
+    page.evaluate(FILL_FIELDS_JS, list(values.items()))
+
+
+def is_final_navigation_response(response: Response) -> bool:
+    """A navigation response that is not a redirect, i.e. the document a submit leads to"""
+    return response.request.is_navigation_request() and not 300 <= response.status < 400
+
+
+def submit_form(page: Page) -> ProbeResponse:
+    """
+    Submit the page's form and snapshot the document it leads to. The snapshot is taken
+    from the navigation response itself, following any redirect. When client-side
+    validation blocks the submit there is no response, so the current page is used.
+    """
+    if not page.eval_on_selector("form", "form => form.checkValidity()"):
+        page.click(SUBMIT_SELECTOR)
+        return ProbeResponse(page.url, None, page.content())
+
+    with page.expect_response(is_final_navigation_response) as response_info:
+        page.click(SUBMIT_SELECTOR)
+    response = response_info.value
+    return ProbeResponse(response.url, response.status, response.text())
+
+
+def revoke_url(fingerprint: str) -> str:
+    """Build the profile revocation URL for a certificate fingerprint"""
+    return f"http://localhost/profile/certificates/{fingerprint}/revoke"
+
+
+def short_id(value: str) -> Optional[str]:
+    """Keep parametrized test ids readable for the very long inputs; None keeps pytest's default id"""
+    return "very-long" if len(value) > 64 else None
+
+
+@pytest.fixture
+def blocked_resource_types():
+    """No test in this module inspects visuals, so skip images, fonts, styles and media"""
+    return HEAVY_RESOURCE_TYPES
+
+
+@pytest.fixture(scope="module")
+def protected_url_responses(fetch_concurrently):
+    """Unauthenticated responses for every protected URL, fetched in one concurrent sweep"""
+    return fetch_concurrently(PROTECTED_URLS)
+
+
+@pytest.fixture(scope="module")
+def invalid_revocation_responses(fetch_concurrently):
+    """Regular-user responses for every invalid revocation URL, fetched in one concurrent sweep"""
+    return fetch_concurrently([revoke_url(fingerprint) for fingerprint in INVALID_FINGERPRINTS], "accounts")
+
+
+@pytest.fixture(scope="module")
+def invalid_pagination_responses(fetch_concurrently):
+    """Admin responses for every invalid pagination URL, fetched in one concurrent sweep"""
+    return fetch_concurrently(INVALID_PAGINATION_URLS, "admin")
 
 
 class TestNegativePathsAuthentication:
     """Test negative paths related to authentication and authorization."""
 
-    def test_unauthenticated_access_to_protected_pages(self, page: Page):
+    @pytest.mark.parametrize("url", PROTECTED_URLS)
+    def test_unauthenticated_access_to_protected_pages(self, protected_url_responses: Dict[str, ProbeResponse], url: str):
         """Test that unauthenticated users cannot access protected pages."""
 
-        protected_urls = [
-            "http://localhost/profile",
-            "http://localhost/profile/certificates",
-            "http://localhost/admin",
-            "http://localhost/admin/psk",
-            "http://localhost/admin/psk/new",
-            "http://localhost/admin/certificates",
-        ]
-
-        for url in protected_urls:
-            page.goto(url)
-            page.wait_for_load_state("networkidle")
+        response = protected_url_responses[url]
 
-            # Check what's actually on the page
-            current_url = page.url
-            page_content = page.content()
+        # Check what's actually on the page
+        current_url = response.url
+        page_content = response.body
 
-            # Check if this is actually a protected page or if access is properly denied
-            access_properly_denied = (
-                current_url != url or  # Redirected away
-                "login" in current_url.lower() or  # Redirected to login
-                "Login" in page_content or  # Shows login form
-                "Sign in" in page_content or  # Shows sign in
-                "Access denied" in page_content or  # Access denied message
-                "Unauthorized" in page_content or  # Unauthorized message
-                "403" in page_content or  # Forbidden status
-                "404" in page_content or  # Not found (common way to hide protected resources)
-                "Not Found" in page_content or  # Not found page
-                "Please log in" in page_content  # Login prompt
-            )
+        # Check if this is actually a protected page or if access is properly denied
+        access_properly_denied = (
+            current_url != url or  # Redirected away
+            "login" in current_url.lower() or  # Redirected to login
+            ACCESS_DENIED_RE.search(page_content) is not None  # Login prompt, denial or not-found page
+        )
 
-            if not access_properly_denied:
-                # Debug information
-                print(f"DEBUG: URL {url} -> {current_url}")
-                print(f"DEBUG: Page title: {page.title()}")
-                print(f"DEBUG: Page content preview: {page_content[:500]}...")
+        if not access_properly_denied and log.isEnabledFor(logging.DEBUG):
+            log.debug("URL %s -> %s status=%s content=%s...", url, current_url, response.status, page_content[:500])
 
-            assert access_properly_denied, f"Unauthenticated access not properly handled for {url}"
+        assert access_properly_denied, f"Unauthenticated access not properly handled for {url}"
 
-    def test_user_cannot_access_admin_pages(self, authenticated_page: Callable[[str], Page]):
+    @pytest.mark.parametrize("url", ADMIN_URLS)
+    def test_user_cannot_access_admin_pages(self, request_context: Callable[[Optional[str]], APIRequestContext], url: str):
         """Test that regular users cannot access admin-only pages."""
 
-        user_page = authenticated_page("accounts")  # Regular user
-
-        admin_urls = [
-            "http://localhost/admin",
-            "http://localhost/admin/psk",
-            "http://localhost/admin/psk/new",
-            "http://localhost/admin/certificates",
-        ]
+        response = request_context("accounts").get(url)  # Regular user
 
-        for url in admin_urls:
-            user_page.goto(url)
-            user_page.wait_for_load_state("networkidle")
-
-            # Should be denied access or redirected away
-            current_url = user_page.url
-            page_content = user_page.content()
-
-            # Should not successfully load admin content
-            access_denied = (
-                current_url != url or  # Redirected away
-                "Access denied" in page_content or
-                "Forbidden" in page_content or
-                "403" in page_content or
-                "404" in page_content or  # Not found (common way to hide admin resources)
-                "Not Found" in page_content or
-                "Not authorized" in page_content
-            )
+        # Should be denied access or redirected away
+        current_url = response.url
+        page_content = response.text()
 
-            if not access_denied:
-                # Debug information
-                print(f"DEBUG: Admin URL {url} -> {current_url}")
-                print(f"DEBUG: Page title: {user_page.title()}")
-                print(f"DEBUG: Page content preview: {page_content[:300]}...")
+        # Should not successfully load admin content
+        access_denied = (
+            current_url != url or  # Redirected away
+            ADMIN_ACCESS_DENIED_RE.search(page_content) is not None  # Not found is a common way to hide admin resources
+        )
 
-            assert access_denied, f"Regular user gained access to admin page: {url}"
+        if not access_denied and log.isEnabledFor(logging.DEBUG):
+            log.debug("Admin URL %s -> %s status=%s content=%s...", url, current_url, response.status, page_content[:300])
 
-        user_page.close()
+        assert access_denied, f"Regular user gained access to admin page: {url}"
 
     def test_expired_session_handling(self, authenticated_page: Callable[[str], Page]):
         """Test handling of expired sessions during page navigation."""
@@ -122,15 +255,13 @@ class TestNegativePathsAuthentication:
         user_page = authenticated_page("accounts")
 
         # Navigate to a protected page first to establish session
-        user_page.goto("http://localhost/profile")
-        user_page.wait_for_load_state("networkidle")
+        user_page.goto("http://localhost/profile", wait_until="domcontentloaded")
 
         # Simulate session expiration by clearing cookies
         user_page.context.clear_cookies()
 
         # Try to access protected page after session expiration
-        user_page.goto("http://localhost/profile/certificates")
-        user_page.wait_for_load_state("networkidle")
+        user_page.goto("http://localhost/profile/certificates", wait_until="domcontentloaded")
 
         # Should be redirected to login or home page
         current_url = user_page.url
@@ -142,60 +273,57 @@ class TestNegativePathsAuthentication:
 class TestNegativePathsForms:
     """Test negative paths related to form validation and submission."""
 
-    def test_invalid_psk_creation_form_data(self, authenticated_page: Callable[[str], Page]):
+    @pytest.fixture(scope="class")
+    def admin_context(self, browser: Browser, role_storage_state):
+        """One admin context shared by every form test; each test still gets its own page"""
+        context = browser.new_context(
+            ignore_https_errors=True,
+            viewport={"width": 1280, "height": 720},
+            storage_state=role_storage_state("admin"),
+        )
+        block_resources(context, HEAVY_RESOURCE_TYPES)
+        yield context
+        context.close()
+
+    @pytest.fixture
+    def admin_page(self, admin_context: BrowserContext) -> Page:
+        """A fresh page in the shared admin context"""
+        page = admin_context.new_page()
+        page.set_default_timeout(30000)
+        yield page
+        page.close()
+
+    @pytest.mark.parametrize("values, rejection_re, may_stay_on_form, message", [
+        # Submit completely empty form; should show validation errors
+        pytest.param({}, VALIDATION_ERROR_RE, False,
+                     "Empty form submission should show validation errors", id="empty"),
+        # Submit with very long description; should either truncate, reject, or show validation error
+        pytest.param({"description": LONG_DESCRIPTION}, LONG_INPUT_REJECTED_RE, True,
+                     "Overly long description should be handled gracefully", id="long_description"),
+    ])
+    def test_invalid_psk_creation_form_data(self, admin_page: Page, values, rejection_re, may_stay_on_form, message):
         """Test PSK creation with invalid form data."""
 
-        admin_page = authenticated_page("admin")
-
-        admin_page.goto("http://localhost/admin/psk/new")
-        admin_page.wait_for_load_state("networkidle")
-
-        # Test 1: Submit completely empty form
-        admin_page.click('button[type="submit"], input[type="submit"]')
-        admin_page.wait_for_load_state("networkidle")
+        admin_page.goto("http://localhost/admin/psk/new", wait_until="domcontentloaded")
 
-        # Should show validation errors
-        page_content = admin_page.content()
-        validation_error_present = any(error_indicator in page_content.lower() for error_indicator in [
-            "required", "error", "invalid", "validation", "missing"
-        ])
-        assert validation_error_present, "Empty form submission should show validation errors"
-
-        # Test 2: Submit with extremely long description
-        admin_page.goto("http://localhost/admin/psk/new")
-        admin_page.wait_for_load_state("networkidle")
-
-        description_field = admin_page.locator('input[name="description"], textarea[name="description"]')
-        if description_field.count() > 0:
-            # Try to submit with very long description (over 255 characters)
-            long_description = "A" * 500  # Way over typical limits
-            description_field.fill(long_description)
+        if not values or set(values) <= {field["name"] for field in form_fields(admin_page)}:
+            fill_fields(admin_page, {f'[name="{name}"]': value for name, value in values.items()})
 
-            admin_page.click('button[type="submit"], input[type="submit"]')
-            admin_page.wait_for_load_state("networkidle")
-
-            # Should either truncate, reject, or show validation error
-            current_url = admin_page.url
-            page_content = admin_page.content()
+            response = submit_form(admin_page)
+            current_url = response.url
+            page_content = response.body
 
             # Should not silently accept invalid data
             handled_gracefully = (
-                "error" in page_content.lower() or
-                "invalid" in page_content.lower() or
-                "too long" in page_content.lower() or
-                current_url.endswith("/admin/psk/new")  # Stayed on form page
+                rejection_re.search(page_content) is not None or
+                may_stay_on_form and current_url.endswith("/admin/psk/new")  # Stayed on form page
             )
-            assert handled_gracefully, "Overly long description should be handled gracefully"
-
-        admin_page.close()
+            assert handled_gracefully, message
 
-    def test_malformed_form_submissions(self, authenticated_page: Callable[[str], Page]):
+    def test_malformed_form_submissions(self, admin_page: Page, worker_id):
         """Test form submissions with malformed or unexpected data."""
 
-        admin_page = authenticated_page("admin")
-
-        admin_page.goto("http://localhost/admin/psk/new")
-        admin_page.wait_for_load_state("networkidle")
+        admin_page.goto("http://localhost/admin/psk/new", wait_until="domcontentloaded")
 
         # Test: Inject additional form fields via JavaScript
         admin_page.evaluate("""() => {
@@ -221,144 +349,86 @@ class TestNegativePathsForms:
         }""")
 
         # Fill valid form data
-        description_field = admin_page.locator('input[name="description"], textarea[name="description"]')
-        if description_field.count() > 0:
-            description_field.fill("Test PSK with injected fields")
+        fill_fields(admin_page, {'[name="description"]': f"Test PSK with injected fields {worker_id}"})
 
         # Submit form with injected fields
-        admin_page.click('button[type="submit"], input[type="submit"]')
-        admin_page.wait_for_load_state("networkidle")
+        response = submit_form(admin_page)
 
         # Should handle gracefully without privilege escalation
-        page_content = admin_page.content()
-        current_url = admin_page.url
+        page_content = response.body
 
         # Should not crash or give unusual privileges
         no_server_error = "500" not in page_content and "Internal Server Error" not in page_content
         assert no_server_error, "Malformed form data caused server error"
 
-        admin_page.close()
-
-    def test_concurrent_form_submissions(self, authenticated_page: Callable[[str], Page]):
+    def test_concurrent_form_submissions(self, admin_page: Page, post_concurrently, worker_id):
         """Test rapid concurrent form submissions to check for race conditions."""
 
-        admin_page = authenticated_page("admin")
-
-        admin_page.goto("http://localhost/admin/psk/new")
-        admin_page.wait_for_load_state("networkidle")
-
-        # Fill form with valid data
-        description_field = admin_page.locator('input[name="description"], textarea[name="description"]')
-        if description_field.count() > 0:
-            description_field.fill("Race condition test PSK")
-
-        psk_type_field = admin_page.locator('select[name="psk_type"]')
-        if psk_type_field.count() > 0:
-            psk_type_field.select_option("server")
+        admin_page.goto("http://localhost/admin/psk/new", wait_until="domcontentloaded")
 
-        # Submit form multiple times rapidly via JavaScript
-        admin_page.evaluate("""() => {
-            const form = document.querySelector('form');
-            if (form) {
-                // Rapid fire submissions
-                for (let i = 0; i < 5; i++) {
-                    setTimeout(() => {
-                        const submitBtn = form.querySelector('button[type="submit"], input[type="submit"]');
-                        if (submitBtn) submitBtn.click();
-                    }, i * 10);
-                }
-            }
-        }""")
+        # Scrape the form once: its action plus every named control, CSRF token included
+        form = admin_page.eval_on_selector("form", FORM_VALUES_JS)
+        form["values"]["description"] = f"Race condition test PSK {worker_id}"
+        # Choose a server PSK only where the form offers a PSK type, so exactly its own fields are posted
+        if "psk_type" in form["values"]:
+            form["values"]["psk_type"] = "server"
 
-        admin_page.wait_for_load_state("networkidle")
+        # Submit the same form several times at once, sharing the page's session
+        responses = post_concurrently(
+            form["action"],
+            [form["values"]] * CONCURRENT_SUBMISSIONS,
+            storage_state=admin_page.context.storage_state(),
+        )
 
-        # Should handle gracefully without creating multiple resources or crashing
-        page_content = admin_page.content()
-        no_server_error = "500" not in page_content and "Internal Server Error" not in page_content
-        assert no_server_error, "Concurrent form submissions caused server error"
+        accepted = sum(1 for response in responses if response.status < 400)
+        log.debug("Concurrent submissions: %d/%d accepted, statuses=%s",
+                  accepted, len(responses), [response.status for response in responses])
 
-        admin_page.close()
+        # Should handle gracefully without crashing
+        for response in responses:
+            no_server_error = response.status < 500 and "Internal Server Error" not in response.body
+            assert no_server_error, f"Concurrent form submissions caused server error: {response.status}"
 
 
 class TestNegativePathsCertificates:
     """Test negative paths related to certificate operations."""
 
-    def test_invalid_certificate_revocation_requests(self, authenticated_page: Callable[[str], Page]):
+    @pytest.mark.parametrize("fingerprint", INVALID_FINGERPRINTS, ids=short_id)
+    def test_invalid_certificate_revocation_requests(self, invalid_revocation_responses: Dict[str, ProbeResponse], fingerprint: str):
         """Test certificate revocation with invalid data."""
 
-        user_page = authenticated_page("accounts")
+        # Try to revoke non-existent certificate
+        url = revoke_url(fingerprint)
+        response = invalid_revocation_responses[url]
 
-        # Test 1: Try to revoke non-existent certificate
-        invalid_fingerprints = [
-            "nonexistent123",
-            "../../etc/passwd",
-            "<script>alert('xss')</script>",
-            "' OR '1'='1",
-            "null",
-            "",
-            "a" * 1000  # Very long fingerprint
-        ]
-
-        for fingerprint in invalid_fingerprints:
-            revoke_url = f"http://localhost/profile/certificates/{fingerprint}/revoke"
-            user_page.goto(revoke_url)
-            user_page.wait_for_load_state("networkidle")
-
-            # Should handle gracefully with 404 or error message
-            current_url = user_page.url
-            page_content = user_page.content()
-
-            handled_gracefully = (
-                "404" in page_content or
-                "405" in page_content or  # Method not allowed (GET on POST endpoint)
-                "Not Found" in page_content or
-                "Method Not Allowed" in page_content or
-                "Certificate not found" in page_content or
-                "error" in page_content.lower() or
-                current_url != revoke_url  # Redirected away
-            )
+        # Should handle gracefully with 404 or error message
+        current_url = response.url
+        page_content = response.body
 
-            if not handled_gracefully:
-                # Debug information
-                print(f"DEBUG: Certificate URL {revoke_url} -> {current_url}")
-                print(f"DEBUG: Page title: {user_page.title()}")
-                print(f"DEBUG: Page content preview: {page_content[:300]}...")
+        handled_gracefully = (
+            REVOCATION_REJECTED_RE.search(page_content) is not None or  # 405 is a GET on the POST endpoint
+            current_url != url  # Redirected away
+        )
 
-            assert handled_gracefully, f"Invalid certificate fingerprint not handled: {fingerprint}"
+        if not handled_gracefully and log.isEnabledFor(logging.DEBUG):
+            log.debug("Certificate URL %s -> %s status=%s content=%s...", url, current_url, response.status, page_content[:300])
 
-        user_page.close()
+        assert handled_gracefully, f"Invalid certificate fingerprint not handled: {fingerprint}"
 
-    def test_cross_user_certificate_access_attempts(self, authenticated_page: Callable[[str], Page]):
+    def test_cross_user_certificate_access_attempts(self, authenticated_page: Callable[[str], Page], request_context: Callable[[Optional[str]], APIRequestContext], admin_certificate_href: Optional[str]):
         """Test attempts to access other users' certificates."""
 
-        # First, create a certificate as admin user
-        admin_page = authenticated_page("admin")
-        print("Creating certificate as admin user...")
-
-        # Generate a profile to create a certificate
-        admin_page.goto("http://localhost/")
-        admin_page.wait_for_load_state("networkidle")
-        admin_page.click("text=Generate Profile")
-        admin_page.wait_for_timeout(3000)  # Wait for certificate creation
-
-        # Get admin's certificate fingerprint
-        admin_page.goto("http://localhost/profile/certificates")
-        admin_page.wait_for_load_state("networkidle")
-
-        admin_cert_link = admin_page.locator('a[href*="/certificates/"]:has-text("View")').first
-        admin_cert_href = None
-        if admin_cert_link.count() > 0:
-            admin_cert_href = admin_cert_link.get_attribute('href')
-            print(f"Found admin certificate: {admin_cert_href}")
-
-        admin_page.close()
+        # The admin's certificate is created once per deployment by the fixture
+        admin_cert_href = admin_certificate_href
+        if admin_cert_href:
+            log.debug("Found admin certificate: %s", admin_cert_href)
 
         # Now test as regular user trying to access admin's certificate
         user_page = authenticated_page("accounts")
 
         # Test 1: Try to access admin's certificate directly if we found one
         if admin_cert_href:
-            print(f"Testing direct access to admin certificate: {admin_cert_href}")
+            log.debug("Testing direct access to admin certificate: %s", admin_cert_href)
             # Convert relative URL to absolute URL
             if admin_cert_href.startswith('/'):
                 full_admin_cert_url = f"http://localhost{admin_cert_href}"
@@ -366,15 +436,14 @@ class TestNegativePathsCertificates:
                 full_admin_cert_url = admin_cert_href
 
             try:
-                user_page.goto(full_admin_cert_url)
-                user_page.wait_for_load_state("networkidle")
+                user_page.goto(full_admin_cert_url, wait_until="domcontentloaded")
 
                 page_content = user_page.content()
                 current_url = user_page.url
                 access_denied = False  # Will be set below based on content
             except Exception as e:
                 if "Cannot navigate to invalid URL" in str(e):
-                    print(f"URL navigation failed (expected for invalid URLs): {e}")
+                    log.debug("URL navigation failed (expected for invalid URLs): %s", e)
                     # If URL is invalid, treat as access properly denied
                     access_denied = True
                     page_content = ""
@@ -385,17 +454,12 @@ class TestNegativePathsCertificates:
             if not access_denied:
                 # Should be denied access
                 access_denied = (
-                    "Access denied" in page_content or
-                    "not found" in page_content.lower() or
-                    "unauthorized" in page_content.lower() or
-                    "forbidden" in page_content.lower() or
+                    CROSS_USER_DENIED_RE.search(page_content) is not None or
                     current_url != full_admin_cert_url  # Redirected away
                 )
 
-            if not access_denied:
-                print(f"DEBUG: Direct access to admin cert")
-                print(f"  URL: {admin_cert_href} -> {current_url}")
-                print(f"  Content: {page_content[:300]}...")
+            if not access_denied and log.isEnabledFor(logging.DEBUG):
+                log.debug("Direct access to admin cert %s -> %s content=%s...", admin_cert_href, current_url, page_content[:300])
 
             assert access_denied, f"User could access admin certificate: {admin_cert_href}"
 
@@ -406,41 +470,33 @@ class TestNegativePathsCertificates:
             "http://localhost/admin/certificates",  # Try direct admin access
         ]
 
+        # Only the server's answer matters here, so skip the browser and don't follow redirects
+        user_request = request_context("accounts")
+
         for url in manipulated_urls:
-            print(f"Testing URL manipulation: {url}")
+            log.debug("Testing URL manipulation: %s", url)
             try:
-                user_page.goto(url)
-                user_page.wait_for_load_state("networkidle")
+                response = user_request.get(url, max_redirects=0)
+            except PlaywrightError as e:
+                if "invalid url" not in str(e).lower():
+                    raise
+                # If URL is invalid, treat as access properly blocked
+                log.debug("URL request failed (expected for invalid URLs): %s", e)
+                continue
 
-                page_content = user_page.content()
-                current_url = user_page.url
-                navigation_failed = False
-            except Exception as e:
-                if "Cannot navigate to invalid URL" in str(e):
-                    print(f"URL navigation failed (expected for invalid URLs): {e}")
-                    # If URL is invalid, treat as access properly blocked
-                    navigation_failed = True
-                    page_content = ""
-                    current_url = ""
-                else:
-                    raise e
+            page_content = response.text()
+            location = response.headers.get("location", "")
 
             # Should not grant unauthorized access
             unauthorized_access_blocked = (
-                navigation_failed or  # URL navigation failed entirely
-                "Access denied" in page_content or
-                "not found" in page_content.lower() or
-                "unauthorized" in page_content.lower() or
-                "forbidden" in page_content.lower() or
-                "404" in page_content or
-                current_url != url or  # Redirected away
-                "login" in current_url.lower()  # Redirected to login
+                response.status in {301, 302, 303, 307, 308, 401, 403, 404} or  # Redirected away or refused
+                "login" in location.lower() or  # Redirected to login
+                CROSS_USER_DENIED_RE.search(page_content) is not None or
+                "404" in page_content
             )
 
-            if not unauthorized_access_blocked:
-                print(f"DEBUG: URL manipulation may have succeeded")
-                print(f"  URL: {url} -> {current_url}")
-                print(f"  Content: {page_content[:300]}...")
+            if not unauthorized_access_blocked and log.isEnabledFor(logging.DEBUG):
+                log.debug("URL manipulation may have succeeded %s -> %s %s content=%s...", url, response.status, location, page_content[:300])
 
             assert unauthorized_access_blocked, f"URL manipulation allowed unauthorized access: {url}"
 
@@ -450,124 +506,82 @@ class TestNegativePathsCertificates:
 class TestNegativePathsPagination:
     """Test negative paths related to pagination and data browsing."""
 
-    def test_invalid_pagination_parameters(self, authenticated_page: Callable[[str], Page]):
+    @pytest.mark.parametrize("url", INVALID_PAGINATION_URLS)
+    def test_invalid_pagination_parameters(self, invalid_pagination_responses: Dict[str, ProbeResponse], url: str):
         """Test pagination with invalid parameters."""
 
-        admin_page = authenticated_page("admin")
-
         # Test invalid pagination parameters on admin certificates page
-        invalid_pagination_urls = [
-            "http://localhost/admin/certificates?page=-1",
-            "http://localhost/admin/certificates?page=0",
-            "http://localhost/admin/certificates?page=999999",
-            "http://localhost/admin/certificates?page=abc",
-            "http://localhost/admin/certificates?page=<script>alert('xss')</script>",
-            "http://localhost/admin/certificates?page=' OR '1'='1",
-            "http://localhost/admin/certificates?limit=-1",
-            "http://localhost/admin/certificates?limit=0",
-            "http://localhost/admin/certificates?limit=999999",
-            "http://localhost/admin/certificates?limit=abc",
-        ]
+        log.debug("Testing invalid pagination: %s", url)
+        response = invalid_pagination_responses[url]
 
-        for url in invalid_pagination_urls:
-            print(f"Testing invalid pagination: {url}")
-            admin_page.goto(url)
-            admin_page.wait_for_load_state("networkidle")
+        # Should handle gracefully without crashes
+        page_content = response.body
+        current_url = response.url
 
-            # Should handle gracefully without crashes
-            page_content = admin_page.content()
-            current_url = admin_page.url
-
-            # Check for server errors (be more specific to avoid false positives from CSS)
-            error_patterns = [
-                "500 Internal Server Error",
-                "Internal Server Error",
-                "HTTP 500",
-                "Server Error (500)",
-                "Application Error"
-            ]
-            has_server_error = any(pattern in page_content for pattern in error_patterns)
-            no_server_error = not has_server_error
-
-            if not no_server_error:
-                print(f"DEBUG: Server error on {url}")
-                print(f"  Final URL: {current_url}")
-                for pattern in error_patterns:
-                    if pattern in page_content:
-                        print(f"  Found error pattern: '{pattern}'")
-                        idx = page_content.find(pattern)
-                        if idx != -1:
-                            print(f"  Context: ...{page_content[max(0, idx-50):idx+50]}...")
-                        break
-
-            assert no_server_error, f"Invalid pagination caused server error: {url}"
-
-            # Should either show default page, error message, or redirect safely
-            handled_gracefully = (
-                "certificates" in current_url.lower() or  # Stayed on or redirected to certificates page
-                "admin" in current_url.lower() or  # Stayed on admin pages
-                "error" in page_content.lower() or  # Showed error message
-                "invalid" in page_content.lower() or  # Showed invalid message
-                "bad request" in page_content.lower() or  # Showed bad request
-                current_url.startswith("http://localhost/") and not current_url.startswith("data:")  # Safe redirect
-            )
+        # Check for server errors (be more specific to avoid false positives from CSS)
+        server_error = SERVER_ERROR_RE.search(page_content)
+        no_server_error = server_error is None
 
-            if not handled_gracefully:
-                print(f"DEBUG: Poor pagination handling for {url}")
-                print(f"  Final URL: {current_url}")
-                print(f"  Content: {page_content[:300]}...")
+        if not no_server_error and log.isEnabledFor(logging.DEBUG):
+            idx = server_error.start()
+            log.debug("Server error on %s -> %s pattern=%r context=...%s...",
+                      url, current_url, server_error.group(0), page_content[max(0, idx-50):idx+50])
 
-            assert handled_gracefully, f"Invalid pagination not handled gracefully: {url}"
-            print(f"  ✓ Handled gracefully - final URL: {current_url}")
+        assert no_server_error, f"Invalid pagination caused server error: {url}"
 
-        admin_page.close()
+        # Should either show default page, error message, or redirect safely
+        handled_gracefully = (
+            "certificates" in current_url.lower() or  # Stayed on or redirected to certificates page
+            "admin" in current_url.lower() or  # Stayed on admin pages
+            PAGINATION_REJECTED_RE.search(page_content) is not None or  # Showed error, invalid or bad request message
+            current_url.startswith("http://localhost/") and not current_url.startswith("data:")  # Safe redirect
+        )
+
+        if not handled_gracefully and log.isEnabledFor(logging.DEBUG):
+            log.debug("Poor pagination handling for %s -> %s content=%s...", url, current_url, page_content[:300])
+
+        assert handled_gracefully, f"Invalid pagination not handled gracefully: {url}"
+        log.debug("Handled gracefully - final URL: %s", current_url)
 
-    def test_search_with_malicious_queries(self, authenticated_page: Callable[[str], Page]):
+    @pytest.mark.parametrize("query", MALICIOUS_QUERIES, ids=short_id)
+    def test_search_with_malicious_queries(self, authenticated_page: Callable[[str], Page], query: str):
         """Test search functionality with potentially malicious queries."""
 
         admin_page = authenticated_page("admin")
 
-        admin_page.goto("http://localhost/admin/certificates")
-        admin_page.wait_for_load_state("networkidle")
-
-        # Test malicious search queries
-        malicious_queries = [
-            "<script>alert('xss')</script>",
-            "'; DROP TABLE certificates; --",
-            "../../etc/passwd",
-            "%' OR '1'='1' --",
-            "UNION SELECT * FROM users",
-            "{{7*7}}",  # Template injection
-            "${7*7}",   # Expression injection
-            "\\x00",    # Null byte
-            "a" * 10000  # Very long query
-        ]
+        admin_page.goto("http://localhost/admin/certificates", wait_until="domcontentloaded")
 
-        for query in malicious_queries:
-            # Look for search field and test it
-            search_field = admin_page.locator('input[name="search"], input[type="search"], input[placeholder*="search" i]')
+        # Look for search field and test it
+        has_search_field = any(
+            field["tag"] == "input" and (
+                field["name"] == "search" or field["type"] == "search" or "search" in field["placeholder"].lower()
+            )
+            for field in form_fields(admin_page)
+        )
 
-            if search_field.count() > 0:
-                search_field.fill(query)
+        if has_search_field:
+            search_field = admin_page.locator(SEARCH_FIELD_SELECTOR)
+            fill_fields(admin_page, {SEARCH_FIELD_SELECTOR: query})
 
-                # Submit search (look for search button or press Enter)
-                search_button = admin_page.locator('button[type="submit"], input[type="submit"], button:has-text("Search")')
+            # Submit search (look for search button or press Enter) and wait for the results
+            # document, so the content read below is never the page from before the submit
+            search_button = admin_page.locator('button[type="submit"], input[type="submit"], button:has-text("Search")')
+            with admin_page.expect_response(is_final_navigation_response):
                 if search_button.count() > 0:
                     search_button.click()
                 else:
                     search_field.press("Enter")
+            admin_page.wait_for_load_state("domcontentloaded")
 
-                admin_page.wait_for_load_state("networkidle")
-
-                # Should handle search gracefully
-                page_content = admin_page.content()
+            # Should handle search gracefully
+            page_content = admin_page.content()
 
-                no_server_error = "500" not in page_content and "Internal Server Error" not in page_content
-                assert no_server_error, f"Malicious search query caused server error: {query}"
+            no_server_error = "500" not in page_content and "Internal Server Error" not in page_content
+            assert no_server_error, f"Malicious search query caused server error: {query}"
 
-                # Should not execute scripts or show raw query
-                no_script_execution = query not in page_content or "&lt;" in page_content  # Escaped
-                assert no_script_execution, f"Search query not properly escaped: {query}"
+            # Should not execute scripts or show raw query
+            no_script_execution = query not in page_content or "&lt;" in page_content  # Escaped
+            assert no_script_execution, f"Search query not properly escaped: {query}"
 
         admin_page.close()
 
@@ -591,8 +605,7 @@ class TestNegativePathsAPI:
             ))
 
             # Try to call API endpoint directly via browser
-            page.goto(endpoint)
-            page.wait_for_load_state("networkidle")
+            page.goto(endpoint, wait_until="domcontentloaded")
 
             # Should handle gracefully (might show JSON error or redirect)
             page_content = page.content()
@@ -612,8 +625,7 @@ class TestNegativePathsAPI:
         ))
 
         # Try to access profile page which might call APIs
-        page.goto("http://localhost/profile")
-        page.wait_for_load_state("networkidle")
+        page.goto("http://localhost/profile", wait_until="domcontentloaded")
 
         # Should handle API errors gracefully
         page_content = page.content()
@@ -624,6 +636,11 @@ class TestNegativePathsAPI:
 class TestNegativePathsErrorHandling:
     """Test error handling and recovery scenarios."""
 
+    @pytest.fixture
+    def blocked_resource_types(self):
+        """Resource loading is under test here, so let every request through"""
+        return frozenset()
+
     def test_network_connectivity_issues(self, authenticated_page: Callable[[str], Page]):
         """Test behavior when network requests fail."""
 
@@ -634,8 +651,7 @@ class TestNegativePathsErrorHandling:
         user_page.route("**/assets/**", lambda route: route.abort())
 
         # Try to load page with failed network requests
-        user_page.goto("http://localhost/profile")
-        user_page.wait_for_load_state("networkidle")
+        user_page.goto("http://localhost/profile", wait_until="domcontentloaded")
 
         # Should degrade gracefully rather than breaking completely
         page_content = user_page.content()
@@ -648,25 +664,12 @@ class TestNegativePathsErrorHandling:
 
         user_page.close()
 
-    def test_javascript_errors_handling(self, authenticated_page: Callable[[str], Page]):
+    def test_javascript_errors_handling(self, authenticated_page: Callable[[str], Page], browser_errors: BrowserErrors):
         """Test that JavaScript errors don't break page functionality."""
 
+        # Console errors and JS exceptions are collected by browser_errors
         user_page = authenticated_page("accounts")
 
-        # Track console errors and JS exceptions
-        console_messages = []
-        js_exceptions = []
-
-        def handle_console_message(msg):
-            if msg.type == "error":
-                console_messages.append(msg.text)
-
-        def handle_page_error(error):
-            js_exceptions.append(str(error))
-
-        user_page.on("console", handle_console_message)
-        user_page.on("pageerror", handle_page_error)
-
         # Inject JavaScript that will cause errors
         user_page.add_init_script("""
         // Cause various JS errors after page loads
@@ -681,8 +684,12 @@ class TestNegativePathsErrorHandling:
             }, 200);
 
             setTimeout(() => {
-                // Try invalid function call
-                window.undefinedFunction();
+                // Try invalid function call, then flag that every injected error has fired
+                try {
+                    window.undefinedFunction();
+                } finally {
+                    window.__jsErrorsDone = true;
+                }
             }, 300);
         });
 
@@ -697,59 +704,54 @@ class TestNegativePathsErrorHandling:
         });
         """)
 
-        print("Loading profile page with injected JavaScript errors...")
-        user_page.goto("http://localhost/profile")
-        user_page.wait_for_load_state("networkidle")
+        log.debug("Loading profile page with injected JavaScript errors...")
+        user_page.goto("http://localhost/profile", wait_until="load")
 
-        # Wait a bit for the errors to occur
-        user_page.wait_for_timeout(1000)
+        # Wait for the last injected error to fire
+        user_page.wait_for_function("() => window.__jsErrorsDone === true", timeout=1500)
 
         # Check if there were JS errors but page still functions
         try:
             captured_errors = user_page.evaluate("() => window.jsErrors || []")
-            print(f"Captured JS errors: {len(captured_errors)}")
-            print(f"Console errors: {len(console_messages)}")
-            print(f"Page exceptions: {len(js_exceptions)}")
+            log.debug("Captured JS errors: %d, console errors: %d, page exceptions: %d",
+                      len(captured_errors), len(browser_errors.console_messages), len(browser_errors.page_exceptions))
         except Exception as e:
-            print(f"Could not evaluate JS errors: {e}")
+            log.debug("Could not evaluate JS errors: %s", e)
 
         # Page should still be functional despite JS errors
         page_title = user_page.title()
         assert page_title, "Page failed to load title despite JS errors"
-        print(f"✓ Page title loaded: {page_title}")
+        log.debug("Page title loaded: %s", page_title)
 
         # Basic page structure should still be present
         page_content = user_page.content()
-        has_basic_structure = all(tag in page_content for tag in ["<html", "<body", "</html>"])
+        has_basic_structure = PAGE_STRUCTURE_RE.search(page_content) is not None
         assert has_basic_structure, "Page structure broken due to JS errors"
-        print("✓ Page structure intact")
+        log.debug("Page structure intact")
 
         # Navigation elements should still be present and functional
         nav_links = user_page.locator('nav a, .nav a, a[href*="profile"], a[href*="certificates"]')
         if nav_links.count() > 0:
-            first_link = nav_links.first
-            try:
-                expect(first_link).to_be_visible(timeout=5000)
-                print("✓ Navigation links visible")
-            except Exception as e:
-                print(f"Navigation link visibility issue: {e}")
+            # One-shot check: the test doesn't fail either way, so don't wait for the link
+            if nav_links.first.is_visible():
+                log.debug("Navigation links visible")
+            else:
                 # Don't fail the test if navigation isn't perfect, just verify page structure
-        else:
+                log.debug("Navigation link not visible")
+        elif log.isEnabledFor(logging.DEBUG):
             # Check if there are any links at all
-            any_links = user_page.locator('a')
-            link_count = any_links.count()
-            print(f"Found {link_count} total links on page")
+            log.debug("Found %d total links on page", user_page.locator('a').count())
 
         # Try to click a simple element to verify page interactivity
         try:
             # Look for any clickable elements
             clickable_elements = user_page.locator('button, input[type="submit"], a').first
             if clickable_elements.count() > 0:
-                print("✓ Page has clickable elements available")
+                log.debug("Page has clickable elements available")
         except Exception as e:
-            print(f"Interactivity check warning: {e}")
+            log.debug("Interactivity check warning: %s", e)
 
-        print("✓ Page remains functional despite JavaScript errors")
+        log.debug("Page remains functional despite JavaScript errors")
         user_page.close()
 
     def test_missing_resources_handling(self, authenticated_page: Callable[[str], Page]):
@@ -757,28 +759,20 @@ class TestNegativePathsErrorHandling:
 
         user_page = authenticated_page("accounts")
 
-        # Block all static resources
-        user_page.route("**/assets/**", lambda route: route.fulfill(status=404))
-        user_page.route("**/static/**", lambda route: route.fulfill(status=404))
-        user_page.route("**/*.css", lambda route: route.fulfill(status=404))
-        user_page.route("**/*.js", lambda route: route.fulfill(status=404))
-        user_page.route("**/*.png", lambda route: route.fulfill(status=404))
-        user_page.route("**/*.jpg", lambda route: route.fulfill(status=404))
+        # Block all static resources with a single route
+        user_page.route(STATIC_RESOURCE_RE, lambda route: route.abort("blockedbyclient"))
 
-        user_page.goto("http://localhost/profile")
-        user_page.wait_for_load_state("networkidle")
+        user_page.goto("http://localhost/profile", wait_until="domcontentloaded")
 
         # Should still load content, just without styling
         page_content = user_page.content()
 
         # Core content should be present
-        has_content = any(keyword in page_content.lower() for keyword in [
-            "profile", "certificate", "vpn", "user"
-        ])
+        has_content = PROFILE_CONTENT_RE.search(page_content) is not None
         assert has_content, "Page content missing when static resources unavailable"
 
         # Page structure should be intact
-        has_structure = all(tag in page_content for tag in ["<html", "<body", "</html>"])
+        has_structure = PAGE_STRUCTURE_RE.search(page_content) is not None
         assert has_structure, "Page structure broken when static resources unavailable"
 
         user_page.close()
\ No newline at end of file
@@ -6,272 +6,281 @@ End-to-end tests for the new CLI scripts:
 - get_openvpn_computer_config.py (PSK computer profiles)
 
 Tests cover both happy path and security/error scenarios.
+
+The tests can run across pytest-xdist workers (see `make test_cli_scripts`). Each
+worker creates its own PSKs once and writes only to per-test tmp_path directories.
 """
 
 import pytest
 import subprocess
-import time
+import sys
+import itertools
+import re
+import uuid
 import os
-import tempfile
-import shutil
-from pathlib import Path
-from playwright.sync_api import expect, Page
+from concurrent.futures import ThreadPoolExecutor
+from playwright.sync_api import expect
 
 
-class TestNewCLIScriptsE2E:
-    """E2E tests for the three new CLI scripts"""
+# The "PSK: <key>" line printed by flask dev:create-psk
+PSK_RE = re.compile(r"^PSK:\s*(\S+)", re.MULTILINE)
 
-    @pytest.fixture(autouse=True)
-    def setup_cli_paths(self, repository_root):
-        """Setup paths to the new CLI scripts"""
-        self.base_path = str(repository_root / "tools" / "get_openvpn_config")
-        self.profile_script = f"{self.base_path}/get_openvpn_profile.py"
-        self.server_script = f"{self.base_path}/get_openvpn_server_config.py"
-        self.computer_script = f"{self.base_path}/get_openvpn_computer_config.py"
 
-        # Verify scripts exist
-        for script in [self.profile_script, self.server_script, self.computer_script]:
-            assert os.path.exists(script), f"CLI script not found: {script}"
+def extract_psk(output):
+    """Return the key from the first PSK: line of dev:create-psk output, or None"""
+    match = PSK_RE.search(output)
+    return match.group(1) if match else None
 
-    def test_user_profile_oidc_happy_path(self, page, cli_browser_integration):
-        """Test get_openvpn_profile.py with OIDC authentication - happy path"""
-        print("Testing OIDC user profile generation via get_openvpn_profile.py...")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_file = os.path.join(temp_dir, "user-profile.ovpn")
+def create_psk(description, psk_type):
+    """Create a PSK in the frontend container and return its key"""
+    psk_command = [
+        "docker", "exec", "tests-frontend-1", "flask", "dev:create-psk",
+        "--description", description, "--template-set", "Default", "--psk-type", psk_type,
+    ]
 
-            # Use the new profile script with OIDC authentication
-            cli_command = f"python3 {self.profile_script} --server-url http://localhost --output {output_file}"
+    try:
+        psk_result = subprocess.run(psk_command, capture_output=True, text=True, timeout=10)
+    except subprocess.TimeoutExpired as e:
+        pytest.fail(f"{psk_type.capitalize()} PSK creation timed out: {e}")
 
-            try:
-                # Start CLI command in background to capture auth URL
-                cli_process, captured_url = cli_browser_integration.start_cli_command_background(cli_command)
+    assert psk_result.returncode == 0, f"Could not create {psk_type} PSK: {psk_result.stderr}"
 
-                # OIDC profile should require browser authentication
-                assert captured_url is not None and captured_url != "", "OIDC profile should require browser auth"
-                assert "http://localhost/auth/login" in captured_url, "Should redirect to OIDC login"
+    psk_key = extract_psk(psk_result.stdout)
+    if psk_key is None:
+        pytest.fail(f"Could not extract PSK from CLI output: {psk_result.stdout}")
+    return psk_key
 
-                print(f"  → Captured auth URL: {captured_url}")
 
-                # Use Playwright to navigate to the auth URL and complete login
-                page.goto(captured_url)
+# Pool entry name -> PSK type; each PSK test consumes its own entry
+PSK_POOL = {
+    "server": "server",
+    "computer_a": "computer",
+    "computer_b": "computer",
+}
 
-                # Should be redirected to tiny-oidc login page
-                from playwright.sync_api import expect
-                expect(page.locator("h1")).to_contain_text("Login - kinda", timeout=10000)
 
-                # Click admin login button
-                login_button = page.locator('button:has-text("Login as admin")')
-                expect(login_button).to_be_visible(timeout=5000)
-                login_button.click()
+# Random per process, so descriptions never collide across xdist workers or runs
+RUN_ID = uuid.uuid4().hex[:8]
+_description_counter = itertools.count()
 
-                # Wait for authentication to complete and CLI to finish
-                page.wait_for_load_state("networkidle", timeout=15000)
 
-                # Wait for CLI process to complete
-                cli_process.wait(timeout=30)
+def unique_description(prefix):
+    """Build a PSK description that is unique across tests, workers and runs"""
+    return f"{prefix} {RUN_ID}-{next(_description_counter)}"
 
-                # Verify CLI completed successfully
-                if cli_process.returncode != 0:
-                    stdout, stderr = cli_process.communicate()
-                    pytest.fail(f"CLI command failed with return code {cli_process.returncode}: {stderr}")
 
-                # Verify profile file was created
-                assert os.path.exists(output_file), "Profile file should be created"
+@pytest.fixture(scope="session")
+def psk_pool():
+    """
+    PSKs for the PSK tests, created once per xdist worker. The docker exec calls run
+    concurrently, so setup costs about one PSK creation.
+    """
+    with ThreadPoolExecutor(max_workers=len(PSK_POOL)) as executor:
+        futures = {
+            name: executor.submit(create_psk, unique_description(f"E2E {name} Test"), psk_type)
+            for name, psk_type in PSK_POOL.items()
+        }
+        psks = {name: future.result() for name, future in futures.items()}
 
-                # Verify file contains expected OpenVPN content
-                with open(output_file, 'r') as f:
-                    content = f.read()
-                    assert 'client' in content, "Profile should contain client directive"
-                    assert 'remote' in content, "Profile should contain remote directive"
-                    print("✓ User profile generated successfully via get_openvpn_profile.py")
-
-            except subprocess.TimeoutExpired as e:
-                pytest.fail(f"CLI profile generation timed out: {e}")
-            except Exception as e:
-                print(f"  ! Authentication flow failed: {e}")
-                pytest.fail(f"OIDC authentication flow failed: {e}")
-            finally:
-                # Clean up CLI process if still running
-                try:
-                    if 'cli_process' in locals() and cli_process.poll() is None:
-                        cli_process.terminate()
-                        cli_process.wait(timeout=5)
-                except:
-                    pass
-
-    def test_server_config_psk_happy_path(self, authenticated_page):
-        """Test get_openvpn_server_config.py with PSK authentication - happy path"""
-        print("Testing server config generation via get_openvpn_server_config.py...")
+    for name, psk_key in psks.items():
+        print(f"✓ Created {PSK_POOL[name]} PSK {name}: {psk_key[:8]}...")
+    return psks
 
-        # Step 1: Create PSK for server bundle
-        description = f"E2E Server Test {int(time.time())}"
-        psk_command = f"docker exec tests-frontend-1 flask dev:create-psk --description '{description}' --template-set Default --psk-type server"
 
-        try:
-            psk_result = subprocess.run(psk_command, shell=True, capture_output=True, text=True, timeout=10)
+# Attribute name -> script file in tools/get_openvpn_config
+CLI_SCRIPTS = {
+    "profile_script": "get_openvpn_profile.py",
+    "server_script": "get_openvpn_server_config.py",
+    "computer_script": "get_openvpn_computer_config.py",
+}
 
-            assert psk_result.returncode == 0, f"Could not create server PSK: {psk_result.stderr}"
 
-            # Extract PSK from output
-            psk_key = None
-            for line in psk_result.stdout.split('\n'):
-                if line.startswith('PSK:'):
-                    psk_key = line.split('PSK:')[1].strip()
-                    break
+@pytest.fixture(scope="module")
+def cli_script_paths(tools_dir):
+    """Absolute paths of the CLI scripts, checked to exist once per module"""
+    base_path = tools_dir / "get_openvpn_config"
+    paths = {name: str(base_path / script) for name, script in CLI_SCRIPTS.items()}
 
-            assert psk_key is not None, f"Could not extract PSK from CLI output: {psk_result.stdout}"
+    # Verify scripts exist
+    for script in paths.values():
+        assert os.path.exists(script), f"CLI script not found: {script}"
 
-            print(f"✓ Created server PSK: {psk_key[:8]}...")
+    return paths
 
-        except subprocess.TimeoutExpired as e:
-            pytest.fail(f"Server PSK creation timed out: {e}")
 
-        # Step 2: Use new server config script
-        with tempfile.TemporaryDirectory() as temp_dir:
-            target_dir = os.path.join(temp_dir, "server-config")
-
-            cli_command = f"python3 {self.server_script} --server-url http://localhost --psk {psk_key} --target-dir {target_dir} --force"
+class TestNewCLIScriptsE2E:
+    """E2E tests for the three new CLI scripts"""
 
-            try:
-                result = subprocess.run(cli_command, shell=True, capture_output=True, text=True, timeout=30)
+    @pytest.fixture(autouse=True)
+    def setup_cli_paths(self, cli_script_paths):
+        """Setup paths to the new CLI scripts"""
+        # Resolved interpreter path, reused by every CLI invocation instead of a PATH lookup of python3
+        self.python = sys.executable
+        for name, path in cli_script_paths.items():
+            setattr(self, name, path)
 
-                if result.returncode == 0:
-                    # Verify files were extracted to target directory
-                    extracted_files = os.listdir(target_dir)
-                    assert len(extracted_files) > 0, "Files should be extracted to target directory"
+    def test_user_profile_oidc_happy_path(self, page, cli_browser_integration, tmp_path):
+        """Test get_openvpn_profile.py with OIDC authentication - happy path"""
+        print("Testing OIDC user profile generation via get_openvpn_profile.py...")
 
-                    # Verify expected file types exist
-                    file_names = [f.lower() for f in extracted_files]
-                    assert any('ca' in f or '.crt' in f for f in file_names), "CA certificate should be present"
-                    assert any('server' in f for f in file_names), "Server certificate or key should be present"
-                    assert any('.ovpn' in f for f in file_names), "OpenVPN configuration file should be present"
+        output_file = tmp_path / "user-profile.ovpn"
 
-                    print("✓ Server configuration generated successfully via get_openvpn_server_config.py")
-                else:
-                    pytest.fail(f"Server config generation failed: {result.stderr}")
+        # Use the new profile script with OIDC authentication
+        cli_command = [self.python, self.profile_script, "--server-url", "http://localhost", "--output", str(output_file)]
 
-            except subprocess.TimeoutExpired as e:
-                pytest.fail(f"Server config generation timed out: {e}")
+        try:
+            # Start CLI command in background to capture auth URL
+            cli_process, captured_url = cli_browser_integration.start_cli_command_background(cli_command)
 
-    def test_computer_config_psk_happy_path(self, authenticated_page):
-        """Test get_openvpn_computer_config.py with PSK authentication - happy path"""
-        print("Testing computer config generation via get_openvpn_computer_config.py...")
+            # OIDC profile should require browser authentication
+            assert captured_url is not None and captured_url != "", "OIDC profile should require browser auth"
+            assert "http://localhost/auth/login" in captured_url, "Should redirect to OIDC login"
 
-        # Step 1: Create PSK for computer profile
-        description = f"E2E Computer Test {int(time.time())}"
-        psk_command = f"docker exec tests-frontend-1 flask dev:create-psk --description '{description}' --template-set Default --psk-type computer"
+            print(f"  → Captured auth URL: {captured_url}")
 
-        try:
-            psk_result = subprocess.run(psk_command, shell=True, capture_output=True, text=True, timeout=10)
+            # Use Playwright to navigate to the auth URL and complete login
+            page.goto(captured_url)
 
-            assert psk_result.returncode == 0, f"Could not create computer PSK: {psk_result.stderr}"
+            # Should be redirected to tiny-oidc login page
+            expect(page.locator("h1")).to_contain_text("Login - kinda", timeout=10000)
 
-            # Extract PSK from output
-            psk_key = None
-            for line in psk_result.stdout.split('\n'):
-                if line.startswith('PSK:'):
-                    psk_key = line.split('PSK:')[1].strip()
-                    break
+            # Click admin login button; click() waits for it to be visible
+            page.locator('button:has-text("Login as admin")').click(timeout=5000)
 
-            assert psk_key is not None, f"Could not extract PSK from CLI output: {psk_result.stdout}"
+            # Wait for the OIDC callback to land back on the frontend
+            page.wait_for_url("http://localhost/**", timeout=15000)
 
-            print(f"✓ Created computer PSK: {psk_key[:8]}...")
+            # Wait for CLI process to complete, draining its pipes so it can never block on a full buffer
+            stdout, stderr = cli_process.communicate(timeout=30)
 
-        except subprocess.TimeoutExpired as e:
-            pytest.fail(f"Computer PSK creation timed out: {e}")
+            # Verify CLI completed successfully
+            if cli_process.returncode != 0:
+                pytest.fail(f"CLI command failed with return code {cli_process.returncode}: {stderr}")
 
-        # Step 2: Use new computer config script
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_file = os.path.join(temp_dir, "computer-config.ovpn")
+            # Verify profile file was created
+            assert output_file.exists(), "Profile file should be created"
 
-            cli_command = f"python3 {self.computer_script} --server-url http://localhost --psk {psk_key} --output {output_file} --force"
+            # Verify file contains expected OpenVPN content
+            with open(output_file, 'r') as f:
+                content = f.read()
+                assert 'client' in content, "Profile should contain client directive"
+                assert 'remote' in content, "Profile should contain remote directive"
+                print("✓ User profile generated successfully via get_openvpn_profile.py")
 
+        except subprocess.TimeoutExpired as e:
+            pytest.fail(f"CLI profile generation timed out: {e}")
+        except Exception as e:
+            print(f"  ! Authentication flow failed: {e}")
+            pytest.fail(f"OIDC authentication flow failed: {e}")
+        finally:
+            # Clean up CLI process if still running
             try:
-                result = subprocess.run(cli_command, shell=True, capture_output=True, text=True, timeout=30)
-
-                if result.returncode == 0:
-                    # Verify profile file was created
-                    assert os.path.exists(output_file), "Computer profile file should be created"
-
-                    # Verify file contains expected OpenVPN content (single OVPN file like user profiles)
-                    with open(output_file, 'r') as f:
-                        content = f.read()
-                        print(f"DEBUG: Computer profile content preview: {content[:200]}...")
-                        assert 'client' in content, "Computer profile should contain client directive"
-                        assert 'remote' in content, "Computer profile should contain remote directive"
-                        assert 'cert' in content or 'BEGIN CERTIFICATE' in content, "Computer profile should contain certificate"
-                        assert 'key' in content or 'BEGIN PRIVATE KEY' in content, "Computer profile should contain private key"
+                if 'cli_process' in locals() and cli_process.poll() is None:
+                    cli_process.kill()
+                    cli_process.wait(timeout=5)
+            except:
+                pass
+
+    @pytest.mark.xdist_group("cli_psk")
+    def test_server_config_psk_happy_path(self, authenticated_page, psk_pool, tmp_path):
+        """Test get_openvpn_server_config.py with PSK authentication - happy path"""
+        print("Testing server config generation via get_openvpn_server_config.py...")
 
-                    print("✓ Computer configuration generated successfully via get_openvpn_computer_config.py")
-                else:
-                    pytest.fail(f"Computer config generation failed: {result.stderr}")
+        # Step 1: Use this worker's server PSK
+        psk_key = psk_pool["server"]
 
-            except subprocess.TimeoutExpired as e:
-                pytest.fail(f"Computer config generation timed out: {e}")
+        # Step 2: Use new server config script
+        target_dir = tmp_path / "server-config"
 
-    def test_profile_script_invalid_psk_error_handling(self, cli_browser_integration):
-        """Test get_openvpn_profile.py error handling with invalid server URL"""
-        print("Testing get_openvpn_profile.py error handling...")
+        cli_command = [self.python, self.server_script, "--server-url", "http://localhost", "--psk", psk_key, "--target-dir", str(target_dir), "--force"]
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_file = os.path.join(temp_dir, "test-profile.ovpn")
+        try:
+            result = subprocess.run(cli_command, capture_output=True, text=True, timeout=30)
 
-            # Test with invalid server URL
-            cli_command = f"python3 {self.profile_script} --server-url http://invalid-server.local --output {output_file} --force"
+            if result.returncode == 0:
+                # Verify files were extracted to target directory
+                extracted_files = [f.name for f in target_dir.iterdir()]
+                assert len(extracted_files) > 0, "Files should be extracted to target directory"
 
-            try:
-                result, captured_url = cli_browser_integration.run_cli_command(cli_command, timeout=15)
+                # Verify expected file types exist
+                file_names = [f.lower() for f in extracted_files]
+                assert any('ca' in f or '.crt' in f for f in file_names), "CA certificate should be present"
+                assert any('server' in f for f in file_names), "Server certificate or key should be present"
+                assert any('.ovpn' in f for f in file_names), "OpenVPN configuration file should be present"
 
-                # Should fail with connection error
-                assert result.returncode != 0, "Should fail with invalid server URL"
-                assert not os.path.exists(output_file), "Profile file should not be created on error"
-                print("✓ get_openvpn_profile.py handles connection errors correctly")
+                print("✓ Server configuration generated successfully via get_openvpn_server_config.py")
+            else:
+                pytest.fail(f"Server config generation failed: {result.stderr}")
 
-            except subprocess.TimeoutExpired:
-                print("✓ get_openvpn_profile.py timeout handling working correctly")
+        except subprocess.TimeoutExpired as e:
+            pytest.fail(f"Server config generation timed out: {e}")
 
-    def test_server_script_invalid_psk_error_handling(self):
-        """Test get_openvpn_server_config.py error handling with invalid PSK"""
-        print("Testing get_openvpn_server_config.py error handling...")
+    @pytest.mark.xdist_group("cli_psk")
+    def test_computer_config_psk_happy_path(self, authenticated_page, psk_pool, tmp_path):
+        """Test get_openvpn_computer_config.py with PSK authentication - happy path"""
+        print("Testing computer config generation via get_openvpn_computer_config.py...")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            target_dir = os.path.join(temp_dir, "server-test")
+        # Step 1: Use this worker's computer PSK
+        psk_key = psk_pool["computer_a"]
 
-            # Test with invalid PSK
-            cli_command = f"python3 {self.server_script} --server-url http://localhost --psk invalid-psk-12345 --target-dir {target_dir} --force"
+        # Step 2: Use new computer config script
+        output_file = tmp_path / "computer-config.ovpn"
 
-            try:
-                result = subprocess.run(cli_command, shell=True, capture_output=True, text=True, timeout=15)
+        cli_command = [self.python, self.computer_script, "--server-url", "http://localhost", "--psk", psk_key, "--output", str(output_file), "--force"]
 
-                # Should fail with authentication error
-                assert result.returncode != 0, "Should fail with invalid PSK"
-                assert not os.path.exists(target_dir) or len(os.listdir(target_dir)) == 0, "Target directory should be empty on error"
-                print("✓ get_openvpn_server_config.py handles PSK authentication errors correctly")
+        try:
+            result = subprocess.run(cli_command, capture_output=True, text=True, timeout=30)
 
-            except subprocess.TimeoutExpired:
-                print("✓ get_openvpn_server_config.py timeout handling working correctly")
+            if result.returncode == 0:
+                # Verify profile file was created
+                assert output_file.exists(), "Computer profile file should be created"
 
-    def test_computer_script_invalid_psk_error_handling(self):
-        """Test get_openvpn_computer_config.py error handling with invalid PSK"""
-        print("Testing get_openvpn_computer_config.py error handling...")
+                # Verify file contains expected OpenVPN content (single OVPN file like user profiles)
+                with open(output_file, 'r') as f:
+                    content = f.read()
+                    print(f"DEBUG: Computer profile content preview: {content[:200]}...")
+                    assert 'client' in content, "Computer profile should contain client directive"
+                    assert 'remote' in content, "Computer profile should contain remote directive"
+                    assert 'cert' in content or 'BEGIN CERTIFICATE' in content, "Computer profile should contain certificate"
+                    assert 'key' in content or 'BEGIN PRIVATE KEY' in content, "Computer profile should contain private key"
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_file = os.path.join(temp_dir, "computer-test.ovpn")
+                print("✓ Computer configuration generated successfully via get_openvpn_computer_config.py")
+            else:
+                pytest.fail(f"Computer config generation failed: {result.stderr}")
 
-            # Test with invalid PSK
-            cli_command = f"python3 {self.computer_script} --server-url http://localhost --psk invalid-computer-psk-12345 --output {output_file} --force"
+        except subprocess.TimeoutExpired as e:
+            pytest.fail(f"Computer config generation timed out: {e}")
+
+    @pytest.mark.parametrize("script_attr, auth_args, target_option, target_name", [
+        # Profile script with an unreachable server; print the auth URL rather than opening a browser
+        pytest.param("profile_script", ["--server-url", "http://invalid-server.local", "--output-auth-url", "stderr"],
+                     "--output", "test-profile.ovpn", id="profile-invalid-server"),
+        pytest.param("server_script", ["--server-url", "http://localhost", "--psk", "invalid-psk-12345"],
+                     "--target-dir", "server-test", id="server-invalid-psk"),
+        pytest.param("computer_script", ["--server-url", "http://localhost", "--psk", "invalid-computer-psk-12345"],
+                     "--output", "computer-test.ovpn", id="computer-invalid-psk"),
+    ])
+    def test_invalid_credentials_error_handling(self, script_attr, auth_args, target_option, target_name, tmp_path):
+        """Test that each script fails cleanly, writing nothing, with an invalid server URL or PSK"""
+        script_path = getattr(self, script_attr)
+        script_name = os.path.basename(script_path)
+        print(f"Testing {script_name} error handling...")
+
+        target = tmp_path / target_name
+        cli_command = [self.python, script_path, *auth_args, target_option, str(target), "--force"]
 
-            try:
-                result = subprocess.run(cli_command, shell=True, capture_output=True, text=True, timeout=15)
+        try:
+            result = subprocess.run(cli_command, capture_output=True, text=True, timeout=15)
 
-                # Should fail with authentication error
-                assert result.returncode != 0, "Should fail with invalid PSK"
-                assert not os.path.exists(output_file), "Profile file should not be created on error"
-                print("✓ get_openvpn_computer_config.py handles PSK authentication errors correctly")
+            # Should fail with connection or authentication error
+            assert result.returncode != 0, f"{script_name} should fail with invalid server URL or PSK"
+            nothing_written = not target.exists() or (target.is_dir() and not any(target.iterdir()))
+            assert nothing_written, f"{script_name} should not write {target_name} on error"
+            print(f"✓ {script_name} handles connection and authentication errors correctly")
 
-            except subprocess.TimeoutExpired:
-                print("✓ get_openvpn_computer_config.py timeout handling working correctly")
+        except subprocess.TimeoutExpired:
+            print(f"✓ {script_name} timeout handling working correctly")
 
     def test_scripts_help_output(self):
         """Test that all scripts provide proper help output"""
@@ -285,7 +294,7 @@ class TestNewCLIScriptsE2E:
 
         for script_path, script_name in scripts:
             try:
-                result = subprocess.run(f"python3 {script_path} --help", shell=True, capture_output=True, text=True, timeout=10)
+                result = subprocess.run([self.python, script_path, "--help"], capture_output=True, text=True, timeout=10)
 
                 assert result.returncode == 0, f"{script_name} should provide help"
                 assert "--server-url" in result.stdout, f"{script_name} should have server-url option"
@@ -295,102 +304,86 @@ class TestNewCLIScriptsE2E:
             except subprocess.TimeoutExpired:
                 pytest.fail(f"{script_name} help command timed out")
 
-    def test_file_overwrite_protection(self):
+    def test_file_overwrite_protection(self, tmp_path):
         """Test file overwrite protection in all scripts"""
         print("Testing file overwrite protection...")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Test profile script overwrite protection
-            profile_file = os.path.join(temp_dir, "existing-profile.ovpn")
-            with open(profile_file, 'w') as f:
-                f.write("existing content")
+        # Test profile script overwrite protection
+        profile_file = tmp_path / "existing-profile.ovpn"
+        with open(profile_file, 'w') as f:
+            f.write("existing content")
 
-            cli_command = f"python3 {self.profile_script} --server-url http://localhost --output {profile_file}"
+        cli_command = [self.python, self.profile_script, "--server-url", "http://localhost", "--output", str(profile_file)]
 
-            try:
-                result = subprocess.run(cli_command, shell=True, capture_output=True, text=True, timeout=10)
+        try:
+            result = subprocess.run(cli_command, capture_output=True, text=True, timeout=10)
 
-                # Should fail due to existing file without --force
-                assert result.returncode != 0, "Should fail when output file exists without --force"
-                assert "already exists" in result.stderr, "Should mention file already exists"
+            # Should fail due to existing file without --force
+            assert result.returncode != 0, "Should fail when output file exists without --force"
+            assert "already exists" in result.stderr, "Should mention file already exists"
 
-                # Verify original content is preserved
-                with open(profile_file, 'r') as f:
-                    content = f.read()
-                    assert content == "existing content", "Original file should be preserved"
+            # Verify original content is preserved
+            with open(profile_file, 'r') as f:
+                content = f.read()
+                assert content == "existing content", "Original file should be preserved"
 
-                print("✓ File overwrite protection working correctly")
+            print("✓ File overwrite protection working correctly")
 
-            except subprocess.TimeoutExpired as e:
-                pytest.fail(f"Overwrite protection test timed out: {e}")
+        except subprocess.TimeoutExpired as e:
+            pytest.fail(f"Overwrite protection test timed out: {e}")
 
-    def test_environment_variable_support(self, cli_browser_integration):
+    def test_environment_variable_support(self, cli_browser_integration, tmp_path):
         """Test environment variable support in all scripts"""
         print("Testing environment variable support...")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_file = os.path.join(temp_dir, "env-test.ovpn")
+        output_file = tmp_path / "env-test.ovpn"
 
-            # Test with environment variables
-            env = os.environ.copy()
-            env['OVPN_MANAGER_URL'] = 'http://invalid-env-server.local'
-            env['OVPN_MANAGER_OUTPUT'] = output_file
-            env['OVPN_MANAGER_OVERWRITE'] = 'true'
+        # Test with environment variables, on top of the environment that puts the mock xdg-open on PATH
+        env = dict(cli_browser_integration.env)
+        env['OVPN_MANAGER_URL'] = 'http://invalid-env-server.local'
+        env['OVPN_MANAGER_OUTPUT'] = str(output_file)
+        env['OVPN_MANAGER_OVERWRITE'] = 'true'
 
-            cli_command = f"python3 {self.profile_script}"
+        cli_command = [self.python, self.profile_script]
 
-            try:
-                # Use a custom CLI command runner with environment variables
-                # But still use the CLI browser integration to prevent popups
-                cli_browser_integration.setup_mock_xdg_open()
+        try:
+            # Use a custom CLI command runner with environment variables
+            # But still use the CLI browser integration to prevent popups
+            cli_browser_integration.setup_mock_xdg_open()
 
-                # Add --output-auth-url stderr to prevent browser popups
-                cli_command_with_auth = cli_command + ' --output-auth-url stderr'
+            # Add --output-auth-url stderr to prevent browser popups
+            cli_command_with_auth = [*cli_command, '--output-auth-url', 'stderr']
 
-                result = subprocess.run(cli_command_with_auth, shell=True, capture_output=True, text=True, timeout=10, env=env)
+            result = subprocess.run(cli_command_with_auth, capture_output=True, text=True, timeout=10, env=env)
 
-                # Should use environment variables (and fail due to invalid server)
-                assert result.returncode != 0, "Should fail with invalid server from env var"
-                print("✓ Environment variable support working correctly")
+            # Should use environment variables (and fail due to invalid server)
+            assert result.returncode != 0, "Should fail with invalid server from env var"
+            print("✓ Environment variable support working correctly")
 
-            except subprocess.TimeoutExpired:
-                print("✓ Environment variable test timeout (expected with invalid server)")
+        except subprocess.TimeoutExpired:
+            print("✓ Environment variable test timeout (expected with invalid server)")
 
-    def test_script_security_psk_not_in_output(self, authenticated_page):
+    @pytest.mark.xdist_group("cli_psk")
+    def test_script_security_psk_not_in_output(self, authenticated_page, psk_pool, tmp_path):
         """Test that PSK values are not exposed in error messages or logs"""
         print("Testing PSK security - ensuring PSKs are not exposed in output...")
 
-        # Create a test PSK
-        description = f"Security Test {int(time.time())}"
-        psk_command = f"docker exec tests-frontend-1 flask dev:create-psk --description '{description}' --template-set Default --psk-type computer"
+        # Use a computer PSK of its own from this worker's pool
+        psk_key = psk_pool["computer_b"]
 
         try:
-            psk_result = subprocess.run(psk_command, shell=True, capture_output=True, text=True, timeout=10)
-
-            assert psk_result.returncode == 0, f"Could not create test PSK: {psk_result.stderr}"
-
-            # Extract PSK from output
-            psk_key = None
-            for line in psk_result.stdout.split('\n'):
-                if line.startswith('PSK:'):
-                    psk_key = line.split('PSK:')[1].strip()
-                    break
-
-            assert psk_key is not None, f"Could not extract PSK from CLI output: {psk_result.stdout}"
-
             # Test with invalid server URL to trigger an error
-            with tempfile.TemporaryDirectory() as temp_dir:
-                output_file = os.path.join(temp_dir, "security-test.ovpn")
+            output_file = tmp_path / "security-test.ovpn"
 
-                cli_command = f"python3 {self.computer_script} --server-url http://invalid-security-test.local --psk {psk_key} --output {output_file} --force"
+            cli_command = [self.python, self.computer_script, "--server-url", "http://invalid-security-test.local", "--psk", psk_key, "--output", str(output_file), "--force"]
 
-                result = subprocess.run(cli_command, shell=True, capture_output=True, text=True, timeout=10)
+            result = subprocess.run(cli_command, capture_output=True, text=True, timeout=10)
 
-                # Should fail, but PSK should not appear in error output
-                assert result.returncode != 0, "Should fail with invalid server"
-                assert psk_key not in result.stdout, "PSK should not appear in stdout"
-                assert psk_key not in result.stderr, "PSK should not appear in stderr"
-                print("✓ PSK values are properly protected from exposure in error messages")
+            # Should fail, but PSK should not appear in error output
+            assert result.returncode != 0, "Should fail with invalid server"
+            assert psk_key not in result.stdout, "PSK should not appear in stdout"
+            assert psk_key not in result.stderr, "PSK should not appear in stderr"
+            print("✓ PSK values are properly protected from exposure in error messages")
 
         except subprocess.TimeoutExpired as e:
             pytest.fail(f"PSK security test timed out: {e}")
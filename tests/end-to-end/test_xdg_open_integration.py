@@ -26,19 +26,19 @@ def test_cli_browser_integration_xdg_open_capture(cli_browser_integration):
 
 
 def test_cli_browser_integration_path_setup(cli_browser_integration):
-    """Test that PATH is correctly modified to use mock xdg-open"""
+    """Test that the CLI environment's PATH is correctly modified to use mock xdg-open"""
     
     # Setup mock (this happens in run_cli_command, but we can test it directly)
     cli_browser_integration.setup_mock_xdg_open()
     
-    # Check that our mock is in PATH
-    test_bin_dir = os.path.dirname(cli_browser_integration.mock_xdg_open_path)
-    current_path = os.environ.get('PATH', '')
+    # Check that our mock comes first on the PATH given to CLI commands
+    test_bin_dir = cli_browser_integration.bin_dir
+    cli_path = cli_browser_integration.env['PATH']
     
-    assert test_bin_dir in current_path, "Mock bin directory should be in PATH"
+    assert cli_path.split(os.pathsep)[0] == test_bin_dir, "Mock bin directory should be first in PATH"
     
     # Check that symlink exists and is executable
-    mock_link = os.path.join(test_bin_dir, "xdg-open")
+    mock_link = cli_browser_integration.mock_link
     assert os.path.exists(mock_link), "xdg-open symlink should exist"
     assert os.access(mock_link, os.X_OK), "xdg-open symlink should be executable"
 
@@ -62,8 +62,7 @@ def test_cli_browser_integration_cleanup(cli_browser_integration):
     cli_browser_integration.setup_mock_xdg_open()
     
     # Verify mock setup creates expected files
-    test_bin_dir = os.path.dirname(cli_browser_integration.mock_xdg_open_path)
-    mock_link = os.path.join(test_bin_dir, "xdg-open")
+    mock_link = cli_browser_integration.mock_link
     
     if os.path.exists(mock_link):
         # Test fallback by running xdg-open directly
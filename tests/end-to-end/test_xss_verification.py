@@ -10,6 +10,7 @@ from playwright.sync_api import Page, expect
 from typing import Callable
 
 
+@pytest.mark.needs_assets  # Payloads rely on real <img> loads failing
 class TestXSSProtectionE2E:
     """E2E tests for XSS protection in browser sessions."""
 